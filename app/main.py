@@ -12,6 +12,66 @@ app = FastAPI(title="CSV Preview App")
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
 
+# Forced-sale signal phrases by tier, compiled once rather than per title
+VERY_STRONG_RES = [re.compile(p) for p in (
+    r"\bmortgagee\b",
+    r"\bmortgage(s|e)?\b",
+    r"\bdeceased estate\b",
+    r"\bmust\s+sell\b",
+    r"\bno\s+plan\s*b\b",
+    r"\burgent(\s+sale)?\b",
+    r"\bas[-\s]?is(\s*\/\s*where[-\s]?is)?\b",
+    r"\bfire\s+sale\b",
+)]
+MEDIUM_RES = [re.compile(p) for p in (
+    r"\bvendor\s+relocated\b",
+    r"\bvendor\s+committed\b",
+    r"\bfinal\s+call\b",
+    r"\blast\s+chance\b",
+    r"\bpriced\s+to\s+sell\b",
+    r"\bmust\s+be\s+sold\b",
+    r"\bmotivated\s+vendor\b",
+    r"\bno\s+plan\s*b\b",
+)]
+WEAK_RES = [re.compile(p) for p in (
+    r"\bopportunity\b",
+    r"\binvestors?\b",
+    r"\baffordable\b",
+    r"\bbrand\s+new\b",
+    r"\bpriced\s+to\s+sell\b",
+)]
+DAYS_AGO_RE = re.compile(r"^(\d{1,3})\s+days?\s+ago$")
+NUMBER_RE = re.compile(r"(\d+(?:\.\d+)?)")
+DOLLAR_RE = re.compile(r"\$\s*([0-9]{1,3}(?:,[0-9]{3})+|[0-9]+)(?:\.[0-9]{1,2})?")
+
+# Listing date vocabulary, built once instead of on every parse_listing_date call
+MONTHS = {
+    'jan': 1, 'january': 1,
+    'feb': 2, 'february': 2,
+    'mar': 3, 'march': 3,
+    'apr': 4, 'april': 4,
+    'may': 5,
+    'jun': 6, 'june': 6,
+    'jul': 7, 'july': 7,
+    'aug': 8, 'august': 8,
+    'sep': 9, 'sept': 9, 'september': 9,
+    'oct': 10, 'october': 10,
+    'nov': 11, 'november': 11,
+    'dec': 12, 'december': 12,
+}
+WEEKDAY_PREFIXES = frozenset(["mon", "tue", "wed", "thu", "fri", "sat", "sun"])
+LISTING_DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%d/%m/%Y",
+    "%m/%d/%Y",
+    "%d-%m-%Y",
+    "%Y/%m/%d",
+    "%d %b %Y",
+    "%d %B %Y",
+    "%b %d, %Y",
+    "%B %d, %Y",
+)
+
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
@@ -21,18 +81,19 @@ async def preview(file: UploadFile = File(...)):
     if not file.filename.lower().endswith((".csv", ".txt")):
         return JSONResponse(status_code=400, content={"error": "Only CSV or TXT files supported"})
 
-    content = await file.read()
+    # Parse straight off the spooled upload instead of holding the bytes, the
+    # decoded text and every row in memory at once
     try:
-        buf = io.StringIO(content.decode("utf-8", errors="ignore"))
-        reader = csv.reader(buf)
-        rows = list(reader)
+        stream = io.TextIOWrapper(file.file, encoding="utf-8", errors="ignore", newline="")
+        reader = csv.reader(stream)
+        header_row = next(reader, None)
     except Exception:
         return JSONResponse(status_code=400, content={"error": "Failed to parse CSV/TXT"})
 
-    if not rows:
+    if header_row is None:
         return {"headers": [], "rows": []}
 
-    raw_headers = [h.strip() for h in rows[0]]
+    raw_headers = [h.strip() for h in header_row]
 
     def normalize(name: str) -> str:
         return "".join(ch for ch in name.lower() if ch.isalnum())
@@ -61,40 +122,24 @@ async def preview(file: UploadFile = File(...)):
             return today_local - timedelta(days=1)
 
         # "x days ago"
-        import re
-        m = re.match(r"^(\d{1,3})\s+days?\s+ago$", lower)
+        m = DAYS_AGO_RE.match(lower)
         if m:
             days = int(m.group(1))
             return today_local - timedelta(days=days)
 
         # Formats like "Thu, 2 Oct" or "2 Oct" (assume current year)
-        month_map = {
-            'jan': 1, 'january': 1,
-            'feb': 2, 'february': 2,
-            'mar': 3, 'march': 3,
-            'apr': 4, 'april': 4,
-            'may': 5,
-            'jun': 6, 'june': 6,
-            'jul': 7, 'july': 7,
-            'aug': 8, 'august': 8,
-            'sep': 9, 'sept': 9, 'september': 9,
-            'oct': 10, 'october': 10,
-            'nov': 11, 'november': 11,
-            'dec': 12, 'december': 12,
-        }
-
         def parse_day_month(s: str):
             s = s.strip().replace(",", " ")
             parts = [p for p in s.split() if p]
             # Remove leading weekday if present
-            if parts and parts[0][:3].lower() in ["mon","tue","wed","thu","fri","sat","sun"]:
+            if parts and parts[0][:3].lower() in WEEKDAY_PREFIXES:
                 parts = parts[1:]
             if len(parts) >= 2:
                 try:
                     day = int(parts[0])
                     mon_key = parts[1].lower()
-                    if mon_key in month_map:
-                        month = month_map[mon_key]
+                    if mon_key in MONTHS:
+                        month = MONTHS[mon_key]
                         return date(today_local.year, month, day)
                 except Exception:
                     return None
@@ -105,18 +150,7 @@ async def preview(file: UploadFile = File(...)):
             return dm
 
         # Try common absolute formats
-        formats = [
-            "%Y-%m-%d",
-            "%d/%m/%Y",
-            "%m/%d/%Y",
-            "%d-%m-%Y",
-            "%Y/%m/%d",
-            "%d %b %Y",
-            "%d %B %Y",
-            "%b %d, %Y",
-            "%B %d, %Y",
-        ]
-        for fmt in formats:
+        for fmt in LISTING_DATE_FORMATS:
             try:
                 return datetime.strptime(raw, fmt).date()
             except Exception:
@@ -152,34 +186,6 @@ async def preview(file: UploadFile = File(...)):
     area_idx = header_map.get("area")
     prop_link_idx = prop_link_raw_idx
 
-    very_strong_patterns = [
-        r"\bmortgagee\b",
-        r"\bmortgage(s|e)?\b",
-        r"\bdeceased estate\b",
-        r"\bmust\s+sell\b",
-        r"\bno\s+plan\s*b\b",
-        r"\burgent(\s+sale)?\b",
-        r"\bas[-\s]?is(\s*\/\s*where[-\s]?is)?\b",
-        r"\bfire\s+sale\b",
-    ]
-    medium_patterns = [
-        r"\bvendor\s+relocated\b",
-        r"\bvendor\s+committed\b",
-        r"\bfinal\s+call\b",
-        r"\blast\s+chance\b",
-        r"\bpriced\s+to\s+sell\b",
-        r"\bmust\s+be\s+sold\b",
-        r"\bmotivated\s+vendor\b",
-        r"\bno\s+plan\s*b\b",
-    ]
-    weak_patterns = [
-        r"\bopportunity\b",
-        r"\binvestors?\b",
-        r"\baffordable\b",
-        r"\bbrand\s+new\b",
-        r"\bpriced\s+to\s+sell\b",
-    ]
-
     def analyze_forced_sale(title: str):
         if not title:
             return 0.0, [], ""
@@ -188,23 +194,23 @@ async def preview(file: UploadFile = File(...)):
         score = 0.0
         # Collect matches per tier
         tier = None
-        for pat in very_strong_patterns:
-            m = re.search(pat, text)
+        for pat in VERY_STRONG_RES:
+            m = pat.search(text)
             if m:
                 matches.append(m.group(0))
                 score = max(score, 1.0)
                 tier = "very strong"
         if score < 1.0:
-            for pat in medium_patterns:
-                m = re.search(pat, text)
+            for pat in MEDIUM_RES:
+                m = pat.search(text)
                 if m:
                     matches.append(m.group(0))
                     score = max(score, 0.6)
                     if not tier:
                         tier = "medium"
         if score < 0.6:
-            for pat in weak_patterns:
-                m = re.search(pat, text)
+            for pat in WEAK_RES:
+                m = pat.search(text)
                 if m:
                     matches.append(m.group(0))
                     score = max(score, 0.2)
@@ -217,7 +223,7 @@ async def preview(file: UploadFile = File(...)):
             return 0.0
         txt = value.lower().replace(",", " ")
         # extract first number (int or float)
-        m = re.search(r"(\d+(?:\.\d+)?)", txt)
+        m = NUMBER_RE.search(txt)
         return float(m.group(1)) if m else 0.0
 
     # Selenium setup (only if at least one PropertyLink exists)
@@ -261,7 +267,7 @@ async def preview(file: UploadFile = File(...)):
             start = max(0, pos - 4000)
             end = min(len(html), pos + 8000)
             window = html[start:end]
-        m = re.search(r"\$\s*([0-9]{1,3}(?:,[0-9]{3})+|[0-9]+)(?:\.[0-9]{1,2})?", window)
+        m = DOLLAR_RE.search(window)
         return m.group(0) if m else ""
 
     def fetch_potential_value(driver, url: str) -> str:
@@ -293,43 +299,55 @@ async def preview(file: UploadFile = File(...)):
             return ""
 
     enriched_rows = []
-    need_driver = any((len(r) > prop_link_idx and r[prop_link_idx]) for r in rows[1:]) if prop_link_idx is not None else False
-    driver = make_driver() if need_driver else None
-    for r in rows[1:]:
-        # Normalize row length to headers
-        current = list(r) + [""] * max(0, len(raw_headers) - len(r))
-
-        listing_raw = (current[list_idx].strip() if list_idx is not None and list_idx < len(current) else "")
-        listing_dt = parse_listing_date(listing_raw)
-        dom_val = (today - listing_dt).days if listing_dt else 0
-
-        fs_score, fs_triggers, fs_rationale = analyze_forced_sale(
-            current[title_idx].strip() if title_idx is not None and title_idx < len(current) else ""
-        )
-
-        area_val = parse_area(current[area_idx]) if area_idx is not None and area_idx < len(current) else 0.0
-        # PotentialValue via PropertyLink
-        potential_value = ""
-        if prop_link_idx is not None and prop_link_idx < len(current):
-            url = (current[prop_link_idx] or "").strip()
-            if url and driver:
-                potential_value = fetch_potential_value(driver, url)
-                time.sleep(1.0)  # small delay to be gentle
-
-        # Build output row: start with original columns
-        out_row = [*current[:len(raw_headers)]]
-        # Insert PotentialValue before PropertyLink
-        pv_at = prop_link_raw_idx if (prop_link_raw_idx is not None and prop_link_raw_idx <= len(raw_headers)) else len(out_row)
-        out_row.insert(pv_at, potential_value)
-        # Insert derived values at the same position used for headers, accounting for PV if inserted before
-        insert_at = (list_idx + 1) if (list_idx is not None and list_idx < len(raw_headers)) else 0
-        if pv_at <= insert_at:
-            insert_at += 1
-        derived_values = [dom_val, f"{fs_score}", ", ".join(sorted(set(fs_triggers))) if fs_triggers else "", fs_rationale]
-        for offset, val in enumerate(derived_values):
-            out_row.insert(insert_at + offset, val)
-
-        enriched_rows.append((out_row, dom_val, fs_score, area_val))
+    driver = None
+    driver_started = False
+    try:
+        for r in reader:
+            # Normalize row length to headers
+            current = list(r) + [""] * max(0, len(raw_headers) - len(r))
+
+            listing_raw = (current[list_idx].strip() if list_idx is not None and list_idx < len(current) else "")
+            listing_dt = parse_listing_date(listing_raw)
+            dom_val = (today - listing_dt).days if listing_dt else 0
+
+            fs_score, fs_triggers, fs_rationale = analyze_forced_sale(
+                current[title_idx].strip() if title_idx is not None and title_idx < len(current) else ""
+            )
+
+            area_val = parse_area(current[area_idx]) if area_idx is not None and area_idx < len(current) else 0.0
+            # PotentialValue via PropertyLink
+            potential_value = ""
+            if prop_link_idx is not None and prop_link_idx < len(current):
+                url = (current[prop_link_idx] or "").strip()
+                # Start the browser on the first row that actually has a link
+                if url and not driver_started:
+                    driver = make_driver()
+                    driver_started = True
+                if url and driver:
+                    potential_value = fetch_potential_value(driver, url)
+                    time.sleep(1.0)  # small delay to be gentle
+
+            # Build output row: start with original columns
+            out_row = [*current[:len(raw_headers)]]
+            # Insert PotentialValue before PropertyLink
+            pv_at = prop_link_raw_idx if (prop_link_raw_idx is not None and prop_link_raw_idx <= len(raw_headers)) else len(out_row)
+            out_row.insert(pv_at, potential_value)
+            # Insert derived values at the same position used for headers, accounting for PV if inserted before
+            insert_at = (list_idx + 1) if (list_idx is not None and list_idx < len(raw_headers)) else 0
+            if pv_at <= insert_at:
+                insert_at += 1
+            derived_values = [dom_val, f"{fs_score}", ", ".join(sorted(set(fs_triggers))) if fs_triggers else "", fs_rationale]
+            for offset, val in enumerate(derived_values):
+                out_row.insert(insert_at + offset, val)
+
+            enriched_rows.append((out_row, dom_val, fs_score, area_val))
+    except csv.Error:
+        if driver:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        return JSONResponse(status_code=400, content={"error": "Failed to parse CSV/TXT"})
 
     # Sort by: Days on Market desc, Forced Sale Likelihood desc, Area desc
     enriched_rows.sort(key=lambda t: (t[1], t[2], t[3]), reverse=True)
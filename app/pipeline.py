@@ -13,7 +13,8 @@ async def process_addresses(addresses: List[str]) -> List[AddressScore]:
     try:
         async def one(addr: str) -> AddressScore:
             dp = await provider.fetch(addr)
-            score, notes, breakdown = score_datapoints(dp)
+            # Scoring renders and writes the HTML report, so keep it off the event loop
+            score, notes, breakdown = await asyncio.to_thread(score_datapoints, dp)
             
             # Create connection data from the comprehensive provider
             connection_data = await provider._get_connection_data(addr)
@@ -66,7 +67,8 @@ async def process_addresses_with_urls(addresses: List[Dict[str, str]]) -> List[A
             
             # RealEstate and HouGarden scrapers removed - only using TradeMe now
             
-            score, notes, breakdown = score_datapoints(dp)
+            # Scoring renders and writes the HTML report, so keep it off the event loop
+            score, notes, breakdown = await asyncio.to_thread(score_datapoints, dp)
             
             # Create connection data with scraper data
             connection_data = ConnectionData(
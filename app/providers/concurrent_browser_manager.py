@@ -23,6 +23,7 @@ class ConcurrentBrowserManager:
         self.browser_locks: List[asyncio.Lock] = []
         self.rate_limit_delay = 2  # Reduced delay for concurrent processing
         self.last_request_times = {}  # Per-browser rate limiting
+        self.in_flight: Dict[tuple, asyncio.Future] = {}  # Shared fetches keyed by (url, site_name)
         
         # Initialize browser pool
         for i in range(max_concurrent_browsers):
@@ -33,7 +34,31 @@ class ConcurrentBrowserManager:
         """
         Fetch property data using a concurrent browser instance.
         If browser_id is provided, uses that specific browser. Otherwise, gets next available.
+        Concurrent requests for the same URL share a single browser session.
         """
+        key = (url, site_name)
+        page_fetch = self.in_flight.get(key)
+        if page_fetch is None:
+            page_fetch = asyncio.ensure_future(self._fetch_page_data(url, site_name, browser_id))
+            self.in_flight[key] = page_fetch
+            page_fetch.add_done_callback(lambda _: self.in_flight.pop(key, None))
+        
+        # Shield the shared fetch so one cancelled caller does not cancel it for the others
+        property_data = await asyncio.shield(page_fetch)
+        
+        return models.DataPoints(
+            address=address,
+            current_valuation_low=property_data.get('low'),
+            current_valuation_mid=property_data.get('mid'),
+            current_valuation_high=property_data.get('high'),
+            last_sale_price=property_data.get('last_sale_price'),
+            last_sale_date=property_data.get('last_sale_date'),
+            valuation_source=property_data.get('source', f'{site_name} (Concurrent Browser)'),
+            method_of_sale=property_data.get('method_of_sale')
+        )
+    
+    async def _fetch_page_data(self, url: str, site_name: str, browser_id: int = None) -> Dict[str, Any]:
+        """Scrape a URL with a browser from the pool, falling back to URL-based estimation"""
         async with self.semaphore:
             # Get next available browser
             if browser_id is None:
@@ -47,34 +72,12 @@ class ConcurrentBrowserManager:
                 await self._enforce_rate_limit(browser_id)
                 
                 # Scrape with the specific browser
-                property_data = await self._scrape_with_browser(browser_id, url, site_name)
-                
-                return models.DataPoints(
-                    address=address,
-                    current_valuation_low=property_data.get('low'),
-                    current_valuation_mid=property_data.get('mid'),
-                    current_valuation_high=property_data.get('high'),
-                    last_sale_price=property_data.get('last_sale_price'),
-                    last_sale_date=property_data.get('last_sale_date'),
-                    valuation_source=property_data.get('source', f'{site_name} (Concurrent Browser)'),
-                    method_of_sale=property_data.get('method_of_sale')
-                )
+                return await self._scrape_with_browser(browser_id, url, site_name)
                 
             except Exception as e:
                 print(f"Error with browser {browser_id}: {e}")
                 # Fallback to URL-based estimation
-                estimated_data = self._estimate_valuation_data_from_url(url, site_name)
-                
-                return models.DataPoints(
-                    address=address,
-                    current_valuation_low=estimated_data.get('low'),
-                    current_valuation_mid=estimated_data.get('mid'),
-                    current_valuation_high=estimated_data.get('high'),
-                    last_sale_price=estimated_data.get('last_sale_price'),
-                    last_sale_date=estimated_data.get('last_sale_date'),
-                    valuation_source=estimated_data.get('source', 'Estimated (Browser Error)'),
-                    method_of_sale=estimated_data.get('method_of_sale')
-                )
+                return self._estimate_valuation_data_from_url(url, site_name)
     
     async def _get_next_available_browser(self) -> int:
         """Get the next available browser ID (round-robin)"""
@@ -1,130 +1,123 @@
 from typing import Tuple
 from .models import DataPoints, ScoringBreakdown
 import os
+import html
 from datetime import datetime
+import textwrap
 
-def generate_scoring_html_report(dp: DataPoints, score: float, notes: str, breakdown: ScoringBreakdown, debug_data: dict) -> str:
-    """Generate HTML report with all scoring calculations and explanations"""
-    
-    html_content = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>RealFlip Scoring Analysis - {dp.address}</title>
-    <style>
-        body {{
+# Report stylesheet, dedented once at import so every saved report carries less whitespace
+REPORT_STYLE = textwrap.dedent("""
+        body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             line-height: 1.6;
             margin: 0;
             padding: 20px;
             background-color: #f5f5f5;
-        }}
-        .container {{
+        }
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             background: white;
             padding: 30px;
             border-radius: 10px;
             box-shadow: 0 0 20px rgba(0,0,0,0.1);
-        }}
-        .header {{
+        }
+        .header {
             text-align: center;
             border-bottom: 3px solid #2c3e50;
             padding-bottom: 20px;
             margin-bottom: 30px;
-        }}
-        .header h1 {{
+        }
+        .header h1 {
             color: #2c3e50;
             margin: 0;
             font-size: 2.5em;
-        }}
-        .header .timestamp {{
+        }
+        .header .timestamp {
             color: #7f8c8d;
             font-size: 0.9em;
             margin-top: 10px;
-        }}
-        .score-summary {{
+        }
+        .score-summary {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 25px;
             border-radius: 10px;
             text-align: center;
             margin-bottom: 30px;
-        }}
-        .score-summary .final-score {{
+        }
+        .score-summary .final-score {
             font-size: 4em;
             font-weight: bold;
             margin: 10px 0;
-        }}
-        .score-summary .score-label {{
+        }
+        .score-summary .score-label {
             font-size: 1.2em;
             opacity: 0.9;
-        }}
-        .section {{
+        }
+        .section {
             margin-bottom: 30px;
             border: 1px solid #e0e0e0;
             border-radius: 8px;
             overflow: hidden;
-        }}
-        .section-header {{
+        }
+        .section-header {
             background: #34495e;
             color: white;
             padding: 15px 20px;
             font-size: 1.3em;
             font-weight: bold;
-        }}
-        .section-content {{
+        }
+        .section-content {
             padding: 20px;
-        }}
-        .variable-grid {{
+        }
+        .variable-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
             gap: 15px;
             margin-bottom: 20px;
-        }}
-        .variable-item {{
+        }
+        .variable-item {
             background: #f8f9fa;
             padding: 15px;
             border-radius: 5px;
             border-left: 4px solid #3498db;
-        }}
-        .variable-name {{
+        }
+        .variable-name {
             font-weight: bold;
             color: #2c3e50;
             margin-bottom: 5px;
-        }}
-        .variable-value {{
+        }
+        .variable-value {
             font-size: 1.1em;
             color: #27ae60;
             font-weight: bold;
-        }}
-        .variable-description {{
+        }
+        .variable-description {
             font-size: 0.9em;
             color: #7f8c8d;
             margin-top: 5px;
-        }}
-        .calculation-step {{
+        }
+        .calculation-step {
             background: #fff3cd;
             border: 1px solid #ffeaa7;
             border-radius: 5px;
             padding: 15px;
             margin: 10px 0;
-        }}
-        .calculation-step .step-title {{
+        }
+        .calculation-step .step-title {
             font-weight: bold;
             color: #856404;
             margin-bottom: 8px;
-        }}
-        .calculation-step .step-formula {{
+        }
+        .calculation-step .step-formula {
             font-family: 'Courier New', monospace;
             background: #f8f9fa;
             padding: 8px;
             border-radius: 3px;
             margin: 5px 0;
-        }}
-        .breakdown-item {{
+        }
+        .breakdown-item {
             display: flex;
             justify-content: space-between;
             align-items: center;
@@ -133,46 +126,76 @@ def generate_scoring_html_report(dp: DataPoints, score: float, notes: str, break
             background: #f8f9fa;
             border-radius: 5px;
             border-left: 4px solid #e74c3c;
-        }}
-        .breakdown-item .criteria {{
+        }
+        .breakdown-item .criteria {
             font-weight: bold;
             color: #2c3e50;
-        }}
-        .breakdown-item .score {{
+        }
+        .breakdown-item .score {
             font-size: 1.2em;
             font-weight: bold;
             color: #27ae60;
-        }}
-        .notes {{
+        }
+        .notes {
             background: #e8f4f8;
             border: 1px solid #bee5eb;
             border-radius: 5px;
             padding: 15px;
             margin-top: 20px;
-        }}
-        .notes h3 {{
+        }
+        .notes h3 {
             color: #0c5460;
             margin-top: 0;
-        }}
-        .highlight {{
+        }
+        .highlight {
             background: #fff3cd;
             padding: 2px 6px;
             border-radius: 3px;
             font-weight: bold;
-        }}
+        }
+""").strip()
+
+def generate_scoring_html_report(dp: DataPoints, score: float, notes: str, breakdown: ScoringBreakdown, debug_data: dict, generated_at: datetime = None) -> str:
+    """Generate HTML report with all scoring calculations and explanations"""
+    
+    if generated_at is None:
+        generated_at = datetime.now()
+    
+    # Format each value once; most of them appear several times in the report
+    address = html.escape(dp.address)
+    purchase_price = f'${dp.est_purchase_price:,.0f}' if dp.est_purchase_price else 'N/A'
+    rehab_cost = f'${dp.est_rehab_cost:,.0f}' if dp.est_rehab_cost else 'N/A'
+    after_repair_value = f'${dp.est_after_repair_value:,.0f}' if dp.est_after_repair_value else 'N/A'
+    days_on_market = dp.days_on_market_avg if dp.days_on_market_avg is not None else 'N/A'
+    total_cost = f'${debug_data["total_cost"]:,.0f}' if debug_data.get('total_cost') else 'N/A'
+    net_sale = f'${debug_data["net_sale"]:,.0f}' if debug_data.get('net_sale') else 'N/A'
+    profit = f'${debug_data["profit"]:,.0f}' if debug_data.get('profit') else 'N/A'
+    margin_ratio = f'{debug_data["margin_ratio"]:.1%}' if debug_data.get('margin_ratio') else 'N/A'
+    margin_score = f'{breakdown.margin_score:.1f}' if breakdown.margin_score is not None else 'N/A'
+    dom_score = f'{breakdown.dom_score:.1f}' if breakdown.dom_score is not None else 'N/A'
+    
+    html_content = f"""
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>RealFlip Scoring Analysis - {address}</title>
+    <style>
+{REPORT_STYLE}
     </style>
 </head>
 <body>
     <div class="container">
         <div class="header">
             <h1>🏠 RealFlip Scoring Analysis</h1>
-            <div class="timestamp">Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</div>
+            <div class="timestamp">Generated on {generated_at:%Y-%m-%d %H:%M:%S}</div>
         </div>
         
         <div class="score-summary">
             <div class="final-score">{score:.1f}/10.0</div>
             <div class="score-label">Overall Viability Score</div>
-            <div style="margin-top: 15px; font-size: 1.1em;">Property: {dp.address}</div>
+            <div style="margin-top: 15px; font-size: 1.1em;">Property: {address}</div>
         </div>
         
         <div class="section">
@@ -181,22 +204,22 @@ def generate_scoring_html_report(dp: DataPoints, score: float, notes: str, break
                 <div class="variable-grid">
                     <div class="variable-item">
                         <div class="variable-name">Purchase Price</div>
-                        <div class="variable-value">{f'${dp.est_purchase_price:,.0f}' if dp.est_purchase_price else 'N/A'}</div>
+                        <div class="variable-value">{purchase_price}</div>
                         <div class="variable-description">Estimated purchase price of the property</div>
                     </div>
                     <div class="variable-item">
                         <div class="variable-name">Rehab Cost</div>
-                        <div class="variable-value">{f'${dp.est_rehab_cost:,.0f}' if dp.est_rehab_cost else 'N/A'}</div>
+                        <div class="variable-value">{rehab_cost}</div>
                         <div class="variable-description">Estimated renovation/repair costs</div>
                     </div>
                     <div class="variable-item">
                         <div class="variable-name">After Repair Value (ARV)</div>
-                        <div class="variable-value">{f'${dp.est_after_repair_value:,.0f}' if dp.est_after_repair_value else 'N/A'}</div>
+                        <div class="variable-value">{after_repair_value}</div>
                         <div class="variable-description">Estimated value after renovations</div>
                     </div>
                     <div class="variable-item">
                         <div class="variable-name">Days on Market</div>
-                        <div class="variable-value">{dp.days_on_market_avg if dp.days_on_market_avg is not None else 'N/A'}</div>
+                        <div class="variable-value">{days_on_market}</div>
                         <div class="variable-description">Average days properties stay on market</div>
                     </div>
                 </div>
@@ -209,33 +232,33 @@ def generate_scoring_html_report(dp: DataPoints, score: float, notes: str, break
                 <div class="calculation-step">
                     <div class="step-title">Step 1: Calculate Total Investment</div>
                     <div class="step-formula">Total Cost = Purchase Price + Rehab Cost</div>
-                    <div class="step-formula">Total Cost = {f'${dp.est_purchase_price:,.0f}' if dp.est_purchase_price else 'N/A'} + {f'${dp.est_rehab_cost:,.0f}' if dp.est_rehab_cost else 'N/A'} = {f'${debug_data.get("total_cost", 0):,.0f}' if debug_data.get('total_cost') else 'N/A'}</div>
+                    <div class="step-formula">Total Cost = {purchase_price} + {rehab_cost} = {total_cost}</div>
                 </div>
                 
                 <div class="calculation-step">
                     <div class="step-title">Step 2: Calculate Net Sale Proceeds</div>
                     <div class="step-formula">Net Sale = ARV × (1 - Transaction Costs)</div>
-                    <div class="step-formula">Net Sale = {f'${dp.est_after_repair_value:,.0f}' if dp.est_after_repair_value else 'N/A'} × 0.94 = {f'${debug_data.get("net_sale", 0):,.0f}' if debug_data.get('net_sale') else 'N/A'}</div>
+                    <div class="step-formula">Net Sale = {after_repair_value} × 0.94 = {net_sale}</div>
                     <div class="variable-description">Transaction costs in NZ are typically 6% (legal, agent fees, etc.)</div>
                 </div>
                 
                 <div class="calculation-step">
                     <div class="step-title">Step 3: Calculate Profit</div>
                     <div class="step-formula">Profit = Net Sale - Total Cost</div>
-                    <div class="step-formula">Profit = {f'${debug_data.get("net_sale", 0):,.0f}' if debug_data.get('net_sale') else 'N/A'} - {f'${debug_data.get("total_cost", 0):,.0f}' if debug_data.get('total_cost') else 'N/A'} = {f'${debug_data.get("profit", 0):,.0f}' if debug_data.get('profit') else 'N/A'}</div>
+                    <div class="step-formula">Profit = {net_sale} - {total_cost} = {profit}</div>
                 </div>
                 
                 <div class="calculation-step">
                     <div class="step-title">Step 4: Calculate Profit Margin</div>
                     <div class="step-formula">Margin Ratio = Profit ÷ Total Cost</div>
-                    <div class="step-formula">Margin Ratio = {f'${debug_data.get("profit", 0):,.0f}' if debug_data.get('profit') else 'N/A'} ÷ {f'${debug_data.get("total_cost", 0):,.0f}' if debug_data.get('total_cost') else 'N/A'} = {f'{debug_data.get("margin_ratio", 0):.1%}' if debug_data.get('margin_ratio') else 'N/A'}</div>
+                    <div class="step-formula">Margin Ratio = {profit} ÷ {total_cost} = {margin_ratio}</div>
                 </div>
                 
                 <div class="calculation-step">
                     <div class="step-title">Step 5: Score Assignment</div>
                     <div class="step-formula">If margin ≥ 20%: Full 6.0 points</div>
                     <div class="step-formula">If margin < 20%: Proportional scoring (6.0 × margin ÷ 0.20)</div>
-                    <div class="step-formula">Score = {f'{breakdown.margin_score:.1f}' if breakdown.margin_score is not None else 'N/A'} points</div>
+                    <div class="step-formula">Score = {margin_score} points</div>
                 </div>
             </div>
         </div>
@@ -245,11 +268,11 @@ def generate_scoring_html_report(dp: DataPoints, score: float, notes: str, break
             <div class="section-content">
                 <div class="breakdown-item">
                     <div class="criteria">💰 Profit Margin</div>
-                    <div class="score">{f'{breakdown.margin_score:.1f}' if breakdown.margin_score is not None else 'N/A'}/6.0</div>
+                    <div class="score">{margin_score}/6.0</div>
                 </div>
                 <div class="breakdown-item">
                     <div class="criteria">⏱️ Days on Market</div>
-                    <div class="score">{f'{breakdown.dom_score:.1f}' if breakdown.dom_score is not None else 'N/A'}/1.5</div>
+                    <div class="score">{dom_score}/1.5</div>
                 </div>
             </div>
         </div>
@@ -262,19 +285,19 @@ def generate_scoring_html_report(dp: DataPoints, score: float, notes: str, break
                     <div class="step-formula">≤ 15 days: 1.5 points (fast market)</div>
                     <div class="step-formula">15-90 days: Linear scaling</div>
                     <div class="step-formula">≥ 90 days: 0 points (slow market)</div>
-                    <div class="variable-description">{breakdown.dom_details or 'No data available'}</div>
+                    <div class="variable-description">{html.escape(breakdown.dom_details or 'No data available')}</div>
                 </div>
             </div>
         </div>
         
         <div class="notes">
             <h3>📋 Analysis Notes</h3>
-            <p><strong>Overall Assessment:</strong> {notes}</p>
+            <p><strong>Overall Assessment:</strong> {html.escape(notes)}</p>
             <p><strong>Key Insights:</strong></p>
             <ul>
-                <li>Profit margin of <span class="highlight">{f'{debug_data.get("margin_ratio", 0):.1%}' if debug_data.get('margin_ratio') else 'N/A'}</span> {'exceeds' if debug_data.get('margin_ratio', 0) >= 0.20 else 'is below'} the 20% threshold for optimal returns</li>
-                <li>Total investment required: <span class="highlight">{f'${debug_data.get("total_cost", 0):,.0f}' if debug_data.get('total_cost') else 'N/A'}</span></li>
-                <li>Expected profit: <span class="highlight">{f'${debug_data.get("profit", 0):,.0f}' if debug_data.get('profit') else 'N/A'}</span></li>
+                <li>Profit margin of <span class="highlight">{margin_ratio}</span> {'exceeds' if debug_data.get('margin_ratio', 0) >= 0.20 else 'is below'} the 20% threshold for optimal returns</li>
+                <li>Total investment required: <span class="highlight">{total_cost}</span></li>
+                <li>Expected profit: <span class="highlight">{profit}</span></li>
                 <li>This property {'meets' if score >= 7.0 else 'does not meet'} the criteria for a high-viability flip (≥7.0 score)</li>
             </ul>
         </div>
@@ -359,13 +382,14 @@ def score_datapoints(dp: DataPoints) -> Tuple[float, str, ScoringBreakdown]:
     
     # Generate HTML report (temporarily disabled to fix errors)
     try:
-        html_report = generate_scoring_html_report(dp, final_score, notes, breakdown, debug_data)
+        # One clock read so the report header and its filename agree
+        generated_at = datetime.now()
+        html_report = generate_scoring_html_report(dp, final_score, notes, breakdown, debug_data, generated_at)
         
         # Save HTML report to file
         safe_address = "".join(c for c in dp.address if c.isalnum() or c in (' ', '-', '_')).rstrip()
         safe_address = safe_address.replace(' ', '_')[:50]  # Limit length
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"scoring_report_{safe_address}_{timestamp}.html"
+        filename = f"scoring_report_{safe_address}_{generated_at:%Y%m%d_%H%M%S}.html"
         
         with open(filename, 'w', encoding='utf-8') as f:
             f.write(html_report)
@@ -3,12 +3,14 @@ from flask_cors import CORS
 from config import Config
 from models import db
 from routes import analyze_bp, upload_bp
+from utils.json_provider import ORJSONProvider
 import os
 
 def create_app():
     """Create and configure the Flask application"""
     app = Flask(__name__)
     app.config.from_object(Config)
+    app.json = ORJSONProvider(app)
     
     # Enable CORS for React frontend and production
     CORS(app, resources={
@@ -12,6 +12,11 @@ class Config:
     CACHE_EXPIRY_DAYS = int(os.getenv('CACHE_EXPIRY_DAYS', 7))
     RATE_LIMIT_MIN_DELAY = int(os.getenv('RATE_LIMIT_MIN_DELAY', 2))
     RATE_LIMIT_MAX_DELAY = int(os.getenv('RATE_LIMIT_MAX_DELAY', 5))
+    INSURANCE_FAILURE_THRESHOLD = int(os.getenv('INSURANCE_FAILURE_THRESHOLD', 3))  # consecutive failures
+    INSURANCE_COOLDOWN_SECONDS = int(os.getenv('INSURANCE_COOLDOWN_SECONDS', 3600))  # 1 hour
+    UPLOAD_SCRAPE_WORKERS = int(os.getenv('UPLOAD_SCRAPE_WORKERS', 8))  # concurrent TradeMe scrapes per upload
+    MAX_ANALYZE_BATCH = int(os.getenv('MAX_ANALYZE_BATCH', 50))  # property IDs per /api/analyze request
+    TRADEME_DEBUG = os.getenv('TRADEME_DEBUG', 'false').lower() == 'true'  # dump unparseable search pages to disk
     
     # Financial Defaults
     DEFAULT_INSURANCE = float(os.getenv('DEFAULT_INSURANCE', 1800))
@@ -0,0 +1,22 @@
+"""
+Gunicorn settings for production.
+Run with: gunicorn -c gunicorn.conf.py "app:create_app()"
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# Requests spend most of their time waiting on scraped sites, so run a
+# few threaded worker processes rather than sizing by CPU count: inside a
+# container cpu_count() reports the host's cores, not the container's quota.
+#
+# Scraper rate limiting (BaseScraper) and the insurance circuit breaker are
+# per process, so every extra worker raises the request rate to each scraped
+# site. Raise WEB_CONCURRENCY with that in mind; prefer GUNICORN_THREADS.
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+
+# Analysing several properties involves rate-limited scraping
+timeout = 120
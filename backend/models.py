@@ -1,8 +1,34 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
 from datetime import datetime
 
 db = SQLAlchemy()
 
+
+class utcnow(FunctionElement):
+    """
+    Current UTC time as a naive timestamp, evaluated by the database.
+    
+    Used as a server-side default for rows inserted outside the ORM; values
+    stay comparable with datetime.utcnow(). Tables created before the server
+    defaults existed don't have them (db.create_all() never alters existing
+    tables), so the columns keep their Python-side defaults as well.
+    """
+    type = db.DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    return 'CURRENT_TIMESTAMP'
+
+
+@compiles(utcnow, 'postgresql')
+def _utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
 class Property(db.Model):
     __tablename__ = 'properties'
     
@@ -15,12 +41,18 @@ class Property(db.Model):
     asking_price = db.Column(db.Float)
     sale_method = db.Column(db.String(200))  # e.g., "Auction on 12 Nov", "Deadline sale"
     trademe_url = db.Column(db.String(1000))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, server_default=utcnow())
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, server_default=utcnow(), onupdate=datetime.utcnow)
     
     # Relationships
-    valuations = db.relationship('Valuation', backref='property', lazy=True, cascade='all, delete-orphan')
-    analysis_results = db.relationship('AnalysisResult', backref='property', lazy=True, cascade='all, delete-orphan')
+    # Collections raise instead of lazy loading so N+1 queries fail loudly;
+    # load them explicitly with selectinload() where they are needed. That
+    # includes deletes: the delete-orphan cascade has to load both
+    # collections, so load the property with selectinload() on both before
+    # db.session.delete(). (passive_deletes would need ON DELETE CASCADE,
+    # which db.create_all() never adds to existing tables.)
+    valuations = db.relationship('Valuation', backref='property', lazy='raise_on_sql', cascade='all, delete-orphan')
+    analysis_results = db.relationship('AnalysisResult', backref='property', lazy='raise_on_sql', cascade='all, delete-orphan')
     
     def to_dict(self):
         return {
@@ -33,20 +65,24 @@ class Property(db.Model):
             'asking_price': self.asking_price,
             'sale_method': self.sale_method,
             'trademe_url': self.trademe_url,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
         }
 
 
 class Valuation(db.Model):
     __tablename__ = 'valuations'
+    __table_args__ = (
+        # Latest valuation per property (CacheManager.get_cached_valuation)
+        db.Index('ix_valuation_property_time', 'property_id', db.desc('scraped_at')),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     property_id = db.Column(db.Integer, db.ForeignKey('properties.id'), nullable=False)
     rv = db.Column(db.Float)  # Rateable Value
     cv = db.Column(db.Float)  # Capital Value
     source = db.Column(db.String(200))
-    scraped_at = db.Column(db.DateTime, default=datetime.utcnow)
+    scraped_at = db.Column(db.DateTime, default=datetime.utcnow, server_default=utcnow())
     
     def to_dict(self):
         return {
@@ -55,12 +91,16 @@ class Valuation(db.Model):
             'rv': self.rv,
             'cv': self.cv,
             'source': self.source,
-            'scraped_at': self.scraped_at.isoformat() if self.scraped_at else None,
+            'scraped_at': self.scraped_at,
         }
 
 
 class RecentSale(db.Model):
     __tablename__ = 'recent_sales'
+    __table_args__ = (
+        # Comparable sales lookup (CacheManager.get_cached_sales)
+        db.Index('ix_sales_suburb_beds', 'suburb', 'bedrooms', 'scraped_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     address = db.Column(db.String(500), nullable=False)
@@ -69,7 +109,7 @@ class RecentSale(db.Model):
     floor_area = db.Column(db.Float)
     sale_price = db.Column(db.Float)
     sale_date = db.Column(db.Date)
-    scraped_at = db.Column(db.DateTime, default=datetime.utcnow)
+    scraped_at = db.Column(db.DateTime, default=datetime.utcnow, server_default=utcnow())
     
     def to_dict(self):
         return {
@@ -79,13 +119,17 @@ class RecentSale(db.Model):
             'bedrooms': self.bedrooms,
             'floor_area': self.floor_area,
             'sale_price': self.sale_price,
-            'sale_date': self.sale_date.isoformat() if self.sale_date else None,
-            'scraped_at': self.scraped_at.isoformat() if self.scraped_at else None,
+            'sale_date': self.sale_date,
+            'scraped_at': self.scraped_at,
         }
 
 
 class AnalysisResult(db.Model):
     __tablename__ = 'analysis_results'
+    __table_args__ = (
+        # Latest analysis per property (GET /api/analysis/<id>)
+        db.Index('ix_analysis_property_time', 'property_id', db.desc('analyzed_at')),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     property_id = db.Column(db.Integer, db.ForeignKey('properties.id'), nullable=False)
@@ -118,7 +162,7 @@ class AnalysisResult(db.Model):
     recommended_pp = db.Column(db.Float)
     is_viable = db.Column(db.Boolean, default=False)
     
-    analyzed_at = db.Column(db.DateTime, default=datetime.utcnow)
+    analyzed_at = db.Column(db.DateTime, default=datetime.utcnow, server_default=utcnow())
     
     def to_dict(self):
         return {
@@ -144,6 +188,5 @@ class AnalysisResult(db.Model):
             'post_tax_profit': self.post_tax_profit,
             'recommended_pp': self.recommended_pp,
             'is_viable': self.is_viable,
-            'analyzed_at': self.analyzed_at.isoformat() if self.analyzed_at else None,
+            'analyzed_at': self.analyzed_at,
         }
-
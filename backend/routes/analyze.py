@@ -4,12 +4,18 @@ from scrapers.valuation_scraper import ValuationScraper
 from scrapers.sales_scraper import SalesScraper
 from scrapers.insurance_scraper import InsuranceScraper
 from utils.cache_manager import CacheManager
+from utils.json_provider import static_error
 from utils.similar_property_matcher import SimilarPropertyMatcher
 from calculator import PropertyFlipCalculator
 from config import Config
 
 analyze_bp = Blueprint('analyze', __name__)
 
+# Constant error responses, serialized once
+ERR_NO_PROPERTY_IDS = static_error('No property IDs provided', 400)
+ERR_BAD_PROPERTY_IDS = static_error('Property IDs must be integers', 400)
+ERR_NO_ANALYSIS = static_error('No analysis found for this property', 404)
+
 @analyze_bp.route('/api/analyze', methods=['POST'])
 def analyze_properties():
     """
@@ -22,12 +28,20 @@ def analyze_properties():
     """
     try:
         data = request.get_json()
-        property_ids = data.get('property_ids', [])
+        # Normalise IDs (JSON clients may send "1") and de-duplicate, keeping
+        # order, so repeated IDs aren't scraped twice
+        try:
+            property_ids = list(dict.fromkeys(map(_parse_property_id, data.get('property_ids', []))))
+        except (TypeError, ValueError):
+            return ERR_BAD_PROPERTY_IDS
         
         if not property_ids:
+            return ERR_NO_PROPERTY_IDS
+        
+        if len(property_ids) > Config.MAX_ANALYZE_BATCH:
             return jsonify({
                 'success': False,
-                'error': 'No property IDs provided'
+                'error': f'Too many property IDs (maximum {Config.MAX_ANALYZE_BATCH} per request)'
             }), 400
         
         # Initialize components
@@ -40,8 +54,17 @@ def analyze_properties():
         
         results = []
         
+        # Load all requested properties in one query instead of one per ID
+        properties_by_id = {
+            p.id: p for p in Property.query.filter(Property.id.in_(property_ids)).all()
+        }
+        
+        # Cached comparable sales for each (suburb, bedrooms) group, indexed
+        # once per batch and shared by every property in the group
+        sales_indexes = {}
+        
         for property_id in property_ids:
-            property_obj = Property.query.get(property_id)
+            property_obj = properties_by_id.get(property_id)
             
             if not property_obj:
                 continue
@@ -51,7 +74,7 @@ def analyze_properties():
             # Get or scrape valuation (RV/CV)
             valuation = cache_manager.get_cached_valuation(property_id)
             
-            if not valuation or cache_manager.needs_update(valuation):
+            if not valuation:
                 print("Scraping valuation data...")
                 valuation_data = valuation_scraper.scrape(property_obj.address)
                 valuation = cache_manager.save_valuation(property_id, valuation_data)
@@ -78,20 +101,29 @@ def analyze_properties():
             tv = None  # Target Value (estimated sale price)
             
             if suburb and bedrooms:
-                # Try to get cached sales
-                cached_sales = cache_manager.get_cached_sales(suburb, bedrooms)
+                sales_index = sales_indexes.get((suburb, bedrooms))
                 
-                if not cached_sales or cache_manager.needs_update(cached_sales[0] if cached_sales else None):
-                    print("Scraping recent sales data...")
-                    sales_data = sales_scraper.scrape(suburb, bedrooms, floor_area)
+                if sales_index is None:
+                    # Try to get cached sales (already filtered to valid entries)
+                    cached_sales = cache_manager.get_cached_sales(suburb, bedrooms)
                     
-                    if sales_data:
-                        cache_manager.save_sales(sales_data)
-                        cached_sales = sales_data
+                    if cached_sales:
+                        sales_index = matcher.build_index(cached_sales)
+                        sales_indexes[(suburb, bedrooms)] = sales_index
+                    else:
+                        print("Scraping recent sales data...")
+                        sales_data = sales_scraper.scrape(suburb, bedrooms, floor_area)
+                        
+                        if sales_data:
+                            cache_manager.save_sales(sales_data)
+                        
+                        # Scraped sales are filtered to this property's floor
+                        # area, so they are not shared with the rest of the group
+                        sales_index = matcher.build_index(sales_data)
                 
-                if cached_sales:
+                if sales_index:
                     # Find comparable properties
-                    comparables = matcher.find_comparables(cached_sales, suburb, bedrooms, floor_area)
+                    comparables = matcher.find_comparables(sales_index, suburb, bedrooms, floor_area)
                     
                     if comparables:
                         tv = matcher.calculate_average_sale_price(comparables)
@@ -161,10 +193,7 @@ def get_analysis(property_id):
         analysis = AnalysisResult.query.filter_by(property_id=property_id).order_by(AnalysisResult.analyzed_at.desc()).first()
         
         if not analysis:
-            return jsonify({
-                'success': False,
-                'error': 'No analysis found for this property'
-            }), 404
+            return ERR_NO_ANALYSIS
         
         property_obj = Property.query.get(property_id)
         valuation = cache_mgr.get_cached_valuation(property_id)
@@ -183,3 +212,9 @@ def get_analysis(property_id):
             'error': str(e)
         }), 500
 
+
+def _parse_property_id(value):
+    """Coerce a posted property ID to int, rejecting booleans and fractional numbers"""
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(f'Invalid property ID: {value!r}')
+    return int(value)
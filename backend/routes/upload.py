@@ -1,11 +1,25 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
 from flask import Blueprint, request, jsonify
 from werkzeug.utils import secure_filename
 from utils.csv_parser import CSVParser
+from models import db
 from utils.cache_manager import CacheManager
+from utils.json_provider import static_error
 from scrapers.trademe_scraper import TrademePropertyScraper
+from config import Config
 
 upload_bp = Blueprint('upload', __name__)
 
+# Constant error responses, serialized once
+ERR_NO_FILE = static_error('No file uploaded', 400)
+ERR_NO_FILE_SELECTED = static_error('No file selected', 400)
+ERR_NOT_CSV = static_error('Only CSV files are supported', 400)
+ERR_NO_PROPERTIES = static_error('No valid properties found in CSV', 400)
+
+# Number of CSV rows written per INSERT ... ON CONFLICT statement
+UPSERT_BATCH_SIZE = 500
+
 @upload_bp.route('/api/upload', methods=['POST'])
 def upload_csv():
     """
@@ -22,61 +36,46 @@ def upload_csv():
     try:
         # Check if file was uploaded
         if 'file' not in request.files:
-            return jsonify({
-                'success': False,
-                'error': 'No file uploaded'
-            }), 400
+            return ERR_NO_FILE
         
         file = request.files['file']
         
         if file.filename == '':
-            return jsonify({
-                'success': False,
-                'error': 'No file selected'
-            }), 400
+            return ERR_NO_FILE_SELECTED
         
         # Check file extension
         if not file.filename.lower().endswith('.csv'):
-            return jsonify({
-                'success': False,
-                'error': 'Only CSV files are supported'
-            }), 400
-        
-        # Read file content
-        file_content = file.read().decode('utf-8')
+            return ERR_NOT_CSV
         
-        # Parse CSV
+        # Parse CSV lazily straight from the upload stream
         parser = CSVParser()
-        properties = parser.parse(file_content)
-        
-        if not properties:
-            return jsonify({
-                'success': False,
-                'error': 'No valid properties found in CSV'
-            }), 400
+        properties = parser.parse_stream(file.stream)
         
         # Initialize components
         cache_manager = CacheManager()
         scraper = TrademePropertyScraper()
         
-        # Process properties
+        # Process properties in batches to bound memory: scrape any missing
+        # details for the batch in parallel, then upsert it in one statement.
+        # The whole file is one transaction, so a decode or CSV error partway
+        # through leaves none of the earlier batches saved.
         saved_properties = []
         
-        for prop_data in properties:
-            # Check if we need to scrape additional data from TradeMe URL
-            if prop_data.get('trademe_url') and not prop_data.get('bedrooms'):
-                print(f"Scraping TradeMe URL for additional data: {prop_data['trademe_url']}")
-                scraped_data = scraper.scrape(prop_data['trademe_url'])
+        with ThreadPoolExecutor(max_workers=Config.UPLOAD_SCRAPE_WORKERS) as executor:
+            while True:
+                batch = list(islice(properties, UPSERT_BATCH_SIZE))
+                if not batch:
+                    break
+                
+                _merge_trademe_data(batch, scraper, executor)
                 
-                if scraped_data:
-                    # Merge scraped data with CSV data (CSV data takes precedence)
-                    for key, value in scraped_data.items():
-                        if key not in prop_data or prop_data[key] is None:
-                            prop_data[key] = value
-            
-            # Save to cache/database
-            property_obj = cache_manager.save_property(prop_data)
-            saved_properties.append(property_obj.to_dict())
+                # Save to cache/database
+                saved_properties.extend(p.to_dict() for p in cache_manager.save_properties(batch, commit=False))
+        
+        if not saved_properties:
+            return ERR_NO_PROPERTIES
+        
+        db.session.commit()
         
         return jsonify({
             'success': True,
@@ -85,6 +84,7 @@ def upload_csv():
         })
     
     except Exception as e:
+        db.session.rollback()
         print(f"Error processing CSV upload: {e}")
         import traceback
         traceback.print_exc()
@@ -93,3 +93,29 @@ def upload_csv():
             'error': str(e)
         }), 500
 
+
+def _merge_trademe_data(batch, scraper, executor):
+    """Scrape TradeMe listings for rows missing details and merge the results in place"""
+    # Group rows by URL so a listing repeated in the CSV is only fetched once
+    rows_by_url = {}
+    for prop_data in batch:
+        # Check if we need to scrape additional data from TradeMe URL
+        if prop_data.get('trademe_url') and not prop_data.get('bedrooms'):
+            rows_by_url.setdefault(prop_data['trademe_url'], []).append(prop_data)
+    
+    futures = {}
+    for url in rows_by_url:
+        print(f"Scraping TradeMe URL for additional data: {url}")
+        futures[executor.submit(scraper.scrape, url)] = url
+    
+    for future in as_completed(futures):
+        scraped_data = future.result()
+        
+        if not scraped_data:
+            continue
+        
+        for prop_data in rows_by_url[futures[future]]:
+            # Merge scraped data with CSV data (CSV data takes precedence)
+            for key, value in scraped_data.items():
+                if key not in prop_data or prop_data[key] is None:
+                    prop_data[key] = value
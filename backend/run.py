@@ -2,6 +2,9 @@
 """
 Simple runner script for the Flask application.
 Run with: python run.py
+
+This uses Flask's development server; production deployments run
+gunicorn with gunicorn.conf.py instead.
 """
 
 import os
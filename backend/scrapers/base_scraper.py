@@ -1,7 +1,59 @@
 import time
 import random
+import threading
 import requests
 from abc import ABC, abstractmethod
+from collections import defaultdict
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+# lxml is a C parser and much faster than the pure-Python html.parser;
+# fall back to html.parser where lxml isn't installed
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+
+def _create_session():
+    """Create a requests session with a connection pool sized for concurrent scraping"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# Shared by all scrapers so keep-alive connections (and their TLS handshakes)
+# are reused across scraper instances and API requests. Headers are passed
+# per request rather than mutated on the session, so it is safe to use from
+# multiple threads.
+_SESSION = _create_session()
+
+
+def scan_fields(pattern, text, fields=None):
+    """
+    Find the first match of each field in a single pass over text.
+    
+    Args:
+        pattern: Compiled regex whose alternatives are top-level named groups
+        text: Text to scan
+        fields: Names of the top-level groups; when given, scanning stops
+            as soon as every one of them has matched
+    
+    Returns:
+        Dictionary of field name -> first match object for that field
+    """
+    found = {}
+    wanted = len(fields) if fields else None
+    for match in pattern.finditer(text):
+        found.setdefault(match.lastgroup, match)
+        if len(found) == wanted:
+            break
+    return found
 
 class BaseScraper(ABC):
     """Base class for all scrapers with rate limiting and polite scraping"""
@@ -14,20 +66,31 @@ class BaseScraper(ABC):
         'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15',
     ]
     
+    # Upper bound on any rate-limit sleep (seconds): caps our exponential
+    # backoff, and a host that asks for a longer pause fails fast instead
+    MAX_BACKOFF = 300
+    
+    # Per-host rate limit state, shared by all scrapers so e.g. the valuation
+    # and sales scrapers don't hammer homes.co.nz between them, while requests
+    # to different hosts never wait on each other. The state is per process:
+    # each gunicorn worker paces its own requests (see gunicorn.conf.py).
+    _last_request = defaultdict(float)    # host -> time of last request
+    _blocked_until = defaultdict(float)   # host -> earliest time allowed by server
+    _throttle_strikes = defaultdict(int)  # host -> consecutive 429 responses
+    _rate_lock = threading.Lock()
+    
     def __init__(self, min_delay=2, max_delay=5):
         self.min_delay = min_delay
         self.max_delay = max_delay
-        self.last_request_time = 0
-        self.session = requests.Session()
-        self.session.headers.update(self._get_headers())
+        self.session = _SESSION
     
     def _get_headers(self):
-        """Get randomized headers"""
+        """Get headers with a randomized user agent"""
         return {
             'User-Agent': random.choice(self.USER_AGENTS),
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-NZ,en-US;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate, br',
+            'Accept-Encoding': ACCEPT_ENCODING,  # only offers br when urllib3 can decode it
             'DNT': '1',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
@@ -37,43 +100,121 @@ class BaseScraper(ABC):
             'Cache-Control': 'max-age=0',
         }
     
-    def _enforce_rate_limit(self):
-        """Enforce polite rate limiting between requests"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+    def _enforce_rate_limit(self, host):
+        """
+        Enforce polite rate limiting between requests to the same host.
+        
+        Returns:
+            False without sleeping if the server asked for a pause longer
+            than MAX_BACKOFF, otherwise True once it is safe to send
+        """
+        with self._rate_lock:
+            current_time = time.time()
+            
+            # Don't tie up a request thread for hours on a server's say-so
+            blocked_for = self._blocked_until[host] - current_time
+            if blocked_for > self.MAX_BACKOFF:
+                print(f"{host} is blocked for another {blocked_for:.0f} seconds; skipping request")
+                return False
+            
+            time_since_last = current_time - self._last_request[host]
+            
+            if time_since_last < self.min_delay:
+                # A negative gap means another thread already reserved a later slot
+                sleep_time = random.uniform(self.min_delay, self.max_delay) + max(-time_since_last, 0)
+                throttled = True
+            else:
+                # Random small delay even if enough time has passed
+                sleep_time = random.uniform(0.5, 1.5)
+                throttled = False
+            
+            # Honour any wait the server asked for
+            if blocked_for > sleep_time:
+                sleep_time = blocked_for
+                throttled = True
+            
+            # Reserve the slot before sleeping so concurrent callers queue up
+            self._last_request[host] = current_time + sleep_time
         
-        if time_since_last < self.min_delay:
-            sleep_time = random.uniform(self.min_delay, self.max_delay)
-            print(f"Rate limiting: sleeping for {sleep_time:.2f} seconds...")
-            time.sleep(sleep_time)
+        if throttled:
+            print(f"Rate limiting {host}: sleeping for {sleep_time:.2f} seconds...")
+        time.sleep(sleep_time)
+        return True
+    
+    def _update_rate_limit(self, host, response):
+        """Adjust the per-host delay from rate limit response headers"""
+        headers = response.headers
+        wait = None
+        
+        if response.status_code == 429:
+            wait = self._parse_retry_after(headers.get('Retry-After'))
+            with self._rate_lock:
+                self._throttle_strikes[host] += 1
+                if wait is None:
+                    # Exponential backoff when the server doesn't say how long
+                    wait = min(self.max_delay * 2 ** self._throttle_strikes[host], self.MAX_BACKOFF)
         else:
-            # Random small delay even if enough time has passed
-            time.sleep(random.uniform(0.5, 1.5))
+            with self._rate_lock:
+                self._throttle_strikes.pop(host, None)
+            
+            if headers.get('X-RateLimit-Remaining') == '0':
+                wait = self._parse_rate_limit_reset(headers.get('X-RateLimit-Reset'))
         
-        self.last_request_time = time.time()
+        if wait:
+            print(f"{host} asked us to back off for {wait:.0f} seconds")
+            with self._rate_lock:
+                self._blocked_until[host] = max(self._blocked_until[host], time.time() + wait)
     
-    def _rotate_user_agent(self):
-        """Rotate user agent for next request"""
-        self.session.headers.update({
-            'User-Agent': random.choice(self.USER_AGENTS)
-        })
+    @staticmethod
+    def _parse_retry_after(value):
+        """Parse a Retry-After header (delta seconds or HTTP date) into seconds"""
+        if not value:
+            return None
+        
+        try:
+            return max(float(value), 0)
+        except ValueError:
+            pass
+        
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+        except (TypeError, ValueError):
+            return None
+    
+    @staticmethod
+    def _parse_rate_limit_reset(value):
+        """Parse an X-RateLimit-Reset header (epoch or delta seconds) into seconds"""
+        try:
+            reset = float(value)
+        except (TypeError, ValueError):
+            return None
+        
+        # Large values are absolute epoch timestamps
+        if reset > 1e9:
+            reset -= time.time()
+        
+        return max(reset, 0)
     
     def get(self, url, **kwargs):
-        """Make a GET request with rate limiting and retries"""
-        self._enforce_rate_limit()
-        self._rotate_user_agent()
+        """Make a GET request with per-host rate limiting and retries"""
+        host = urlparse(url).netloc
+        # Rotate user agent per request
+        headers = self._get_headers()
         
         max_retries = 3
         for attempt in range(max_retries):
+            # Retries land within min_delay of the last request, so this also
+            # provides the back-off between attempts
+            if not self._enforce_rate_limit(host):
+                return None
             try:
-                response = self.session.get(url, timeout=30, **kwargs)
+                response = self.session.get(url, headers=headers, timeout=30, **kwargs)
+                self._update_rate_limit(host, response)
                 response.raise_for_status()
                 return response
             except requests.RequestException as e:
                 print(f"Request failed (attempt {attempt + 1}/{max_retries}): {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(random.uniform(2, 5))
-                else:
+                if attempt == max_retries - 1:
                     raise
         
         return None
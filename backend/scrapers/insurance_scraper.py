@@ -1,8 +1,13 @@
 import re
-from bs4 import BeautifulSoup
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from .base_scraper import BaseScraper
 from config import Config
 
+# Bytes pattern so quotes are scanned in the raw body without decoding it
+PRICE_RE = re.compile(rb'\$\s*([\d,]+(?:\.\d{2})?)')
+
 class InsuranceScraper(BaseScraper):
     """
     Scraper for house insurance quotes.
@@ -12,6 +17,18 @@ class InsuranceScraper(BaseScraper):
     to default value as per requirements.
     """
     
+    # (name, url) of NZ's major insurers, tried in order
+    PROVIDERS = [
+        ('AMI', "https://www.ami.co.nz/home-insurance"),
+        ('State', "https://www.state.co.nz/home-insurance"),
+        ('AA Insurance', "https://www.aainsurance.co.nz/home-insurance"),
+    ]
+    
+    # Circuit breaker state shared across instances:
+    # provider name -> (consecutive failures, time of last failure)
+    _provider_failures = {}
+    _failures_lock = threading.Lock()
+    
     def scrape(self, address, replacement_value=None):
         """
         Attempt to get insurance quote.
@@ -34,115 +51,86 @@ class InsuranceScraper(BaseScraper):
         return Config.DEFAULT_INSURANCE
     
     def _try_scrape_quote(self, address, replacement_value):
-        """Attempt to scrape insurance quotes"""
-        try:
-            # Try AMI (one of NZ's major insurers)
-            quote = self._scrape_ami(address, replacement_value)
-            if quote:
-                return quote
-            
-            # Try State Insurance
-            quote = self._scrape_state(address, replacement_value)
-            if quote:
-                return quote
-            
-            # Try AA Insurance
-            quote = self._scrape_aa_insurance(address, replacement_value)
-            if quote:
-                return quote
+        """Attempt to scrape insurance quotes, taking the first provider to succeed"""
+        providers = []
+        for name, url in self.PROVIDERS:
+            if self._is_circuit_open(name):
+                print(f"Skipping {name}: too many recent failures")
+            else:
+                providers.append((name, url))
         
-        except Exception as e:
-            print(f"Error scraping insurance quotes: {e}")
+        if not providers:
+            return None
         
-        return None
-    
-    def _scrape_ami(self, address, replacement_value):
-        """Attempt to scrape AMI insurance quote"""
+        # Query all providers at once so failures cost max(latency), not the sum
+        futures = {}
         try:
-            # AMI requires complex form submission
-            # Most insurance sites use JavaScript-heavy forms
-            # This is a simplified attempt
+            for name, url in providers:
+                futures[_EXECUTOR.submit(self._scrape_provider, name, url)] = name
             
-            url = "https://www.ami.co.nz/home-insurance"
-            response = self.get(url)
-            
-            if not response:
-                return None
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            text = soup.get_text()
-            
-            # Look for any price information
-            price_matches = re.findall(r'\$\s*([\d,]+(?:\.\d{2})?)', text)
-            
-            # Insurance quotes typically range from $1000-$3000 for houses
-            for match in price_matches:
-                try:
-                    price = float(match.replace(',', ''))
-                    if 1000 <= price <= 5000:  # Reasonable range for house insurance
-                        print(f"Found potential AMI quote: ${price}")
-                        return price
-                except ValueError:
-                    continue
+            for future in as_completed(futures):
+                quote = future.result()
+                self._record_result(futures[future], quote)
+                if quote:
+                    return quote
         
         except Exception as e:
-            print(f"Error scraping AMI: {e}")
+            print(f"Error scraping insurance quotes: {e}")
+        
+        finally:
+            # Don't wait on slower providers once we have an answer; calls
+            # still queued behind other requests are dropped
+            for future in futures:
+                future.cancel()
         
         return None
     
-    def _scrape_state(self, address, replacement_value):
-        """Attempt to scrape State Insurance quote"""
-        try:
-            url = "https://www.state.co.nz/home-insurance"
-            response = self.get(url)
-            
-            if not response:
-                return None
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            text = soup.get_text()
-            
-            price_matches = re.findall(r'\$\s*([\d,]+(?:\.\d{2})?)', text)
-            
-            for match in price_matches:
-                try:
-                    price = float(match.replace(',', ''))
-                    if 1000 <= price <= 5000:
-                        print(f"Found potential State quote: ${price}")
-                        return price
-                except ValueError:
-                    continue
+    def _is_circuit_open(self, name):
+        """Check if a provider has failed repeatedly and is still cooling down"""
+        failures, last_failure = self._provider_failures.get(name, (0, 0))
         
-        except Exception as e:
-            print(f"Error scraping State: {e}")
+        if failures < Config.INSURANCE_FAILURE_THRESHOLD:
+            return False
         
-        return None
+        return time.time() - last_failure < Config.INSURANCE_COOLDOWN_SECONDS
+    
+    def _record_result(self, name, quote):
+        """Track consecutive failures per provider for the circuit breaker"""
+        with self._failures_lock:
+            if quote:
+                self._provider_failures.pop(name, None)
+            else:
+                failures, _ = self._provider_failures.get(name, (0, 0))
+                self._provider_failures[name] = (failures + 1, time.time())
     
-    def _scrape_aa_insurance(self, address, replacement_value):
-        """Attempt to scrape AA Insurance quote"""
+    def _scrape_provider(self, name, url):
+        """Attempt to scrape a quote from a single provider's page"""
         try:
-            url = "https://www.aainsurance.co.nz/home-insurance"
+            # Most insurance sites use JavaScript-heavy forms that require
+            # complex form submission. This is a simplified attempt.
             response = self.get(url)
             
             if not response:
                 return None
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            text = soup.get_text()
-            
-            price_matches = re.findall(r'\$\s*([\d,]+(?:\.\d{2})?)', text)
-            
-            for match in price_matches:
+            # Look for any price information. Only $-amounts are needed, so
+            # scan the raw body rather than building a DOM first, and stop
+            # at the first plausible quote.
+            # Insurance quotes typically range from $1000-$3000 for houses
+            for match in PRICE_RE.finditer(response.content):
                 try:
-                    price = float(match.replace(',', ''))
-                    if 1000 <= price <= 5000:
-                        print(f"Found potential AA quote: ${price}")
+                    price = float(match.group(1).replace(b',', b''))
+                    if 1000 <= price <= 5000:  # Reasonable range for house insurance
+                        print(f"Found potential {name} quote: ${price}")
                         return price
                 except ValueError:
                     continue
         
         except Exception as e:
-            print(f"Error scraping AA Insurance: {e}")
+            print(f"Error scraping {name}: {e}")
         
         return None
 
+
+# Shared pool for querying the providers concurrently, one thread per provider
+_EXECUTOR = ThreadPoolExecutor(max_workers=len(InsuranceScraper.PROVIDERS), thread_name_prefix='insurance-scraper')
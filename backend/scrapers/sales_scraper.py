@@ -1,7 +1,31 @@
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
-from .base_scraper import BaseScraper
+from bs4 import BeautifulSoup, SoupStrainer
+from .base_scraper import BaseScraper, HTML_PARSER, scan_fields
+
+# Price, bedrooms, floor area and sale date, extracted in one pass (see scan_fields)
+LISTING_FIELDS_RE = re.compile(
+    r'(?P<price>\$\s*(?P<price_value>[\d,]+))'
+    r'|(?P<bed>(?P<bed_value>\d+)\s*bed)'
+    r'|(?P<area>(?P<area_value>\d+)\s*m[²2])'
+    r'|(?P<sold>sold[:\s]+(?P<sold_value>\d{1,2}[/-]\d{1,2}[/-]\d{2,4}))',
+    re.IGNORECASE
+)
+LISTING_FIELDS = ('price', 'bed', 'area', 'sold')
+LISTING_CLASS_RE = re.compile(r'listing|property|result', re.IGNORECASE)
+SALE_CLASS_RE = re.compile(r'property|listing|sale', re.IGNORECASE)
+ADDRESS_CLASS_RE = re.compile(r'address|title', re.IGNORECASE)
+
+# Sale date formats seen on listings, tried in order
+DATE_FORMATS = ('%d/%m/%Y', '%d-%m-%Y', '%d/%m/%y', '%d-%m-%y')
+
+# Only build a DOM for the listing containers, skipping page chrome and scripts
+REALESTATE_STRAINER = SoupStrainer('div', class_=LISTING_CLASS_RE)
+HOMES_STRAINER = SoupStrainer(['div', 'article'], class_=SALE_CLASS_RE)
+
+# Shared pool for fetching from the sales sources concurrently
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='sales-scraper')
 
 class SalesScraper(BaseScraper):
     """Scraper for recent comparable property sales"""
@@ -26,15 +50,18 @@ class SalesScraper(BaseScraper):
             List of comparable sales or None
         """
         try:
-            # Try multiple sources
-            sales = self._scrape_realestate_co_nz(suburb, bedrooms, floor_area, months)
-            if sales:
-                return sales
-            
-            # Fallback to homes.co.nz
-            sales = self._scrape_homes_co_nz(suburb, bedrooms, floor_area, months)
-            if sales:
-                return sales
+            # Query all sources at once and use whichever returns sales first
+            futures = [
+                _EXECUTOR.submit(source, suburb, bedrooms, floor_area, months)
+                for source in (self._scrape_realestate_co_nz, self._scrape_homes_co_nz)
+            ]
+            
+            for future in as_completed(futures):
+                sales = future.result()
+                if sales:
+                    for other in futures:
+                        other.cancel()
+                    return sales
             
             # If no sales found, return None (will use 90% of CV as per requirements)
             return None
@@ -57,13 +84,13 @@ class SalesScraper(BaseScraper):
             if not response:
                 return None
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(response.content, HTML_PARSER, parse_only=REALESTATE_STRAINER)
             
             # Parse sold properties
             sales = []
-            listings = soup.find_all('div', class_=re.compile(r'listing|property|result', re.I))
+            listings = soup.find_all('div', class_=LISTING_CLASS_RE)
             
-            cutoff_date = datetime.now() - timedelta(days=months * 30)
+            cutoff_date = (datetime.now() - timedelta(days=months * 30)).date()
             
             for listing in listings:
                 sale_data = self._parse_sale_listing(listing, floor_area, cutoff_date)
@@ -87,12 +114,12 @@ class SalesScraper(BaseScraper):
             if not response:
                 return None
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(response.content, HTML_PARSER, parse_only=HOMES_STRAINER)
             
             sales = []
-            listings = soup.find_all(['div', 'article'], class_=re.compile(r'property|listing|sale', re.I))
+            listings = soup.find_all(['div', 'article'], class_=SALE_CLASS_RE)
             
-            cutoff_date = datetime.now() - timedelta(days=months * 30)
+            cutoff_date = (datetime.now() - timedelta(days=months * 30)).date()
             
             for listing in listings:
                 sale_data = self._parse_sale_listing(listing, floor_area, cutoff_date)
@@ -109,21 +136,22 @@ class SalesScraper(BaseScraper):
         """Parse a single sale listing"""
         try:
             text_content = listing_element.get_text()
+            fields = scan_fields(LISTING_FIELDS_RE, text_content, LISTING_FIELDS)
             
             # Extract price
-            price_match = re.search(r'\$\s*([\d,]+)', text_content)
+            price_match = fields.get('price')
             if not price_match:
                 return None
             
-            price = float(price_match.group(1).replace(',', ''))
+            price = float(price_match.group('price_value').replace(',', ''))
             
             # Extract bedrooms
-            bed_match = re.search(r'(\d+)\s*bed', text_content, re.IGNORECASE)
-            bedrooms = int(bed_match.group(1)) if bed_match else None
+            bed_match = fields.get('bed')
+            bedrooms = int(bed_match.group('bed_value')) if bed_match else None
             
             # Extract floor area
-            area_match = re.search(r'(\d+)\s*m[²2]', text_content, re.IGNORECASE)
-            floor_area = int(area_match.group(1)) if area_match else None
+            area_match = fields.get('area')
+            floor_area = int(area_match.group('area_value')) if area_match else None
             
             # Check floor area is within ±20%
             if floor_area and target_floor_area:
@@ -132,13 +160,13 @@ class SalesScraper(BaseScraper):
                     return None
             
             # Extract sale date
-            date_match = re.search(r'sold[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})', text_content, re.IGNORECASE)
+            date_match = fields.get('sold')
             sale_date = None
             if date_match:
                 try:
-                    date_str = date_match.group(1)
+                    date_str = date_match.group('sold_value')
                     # Try to parse various date formats
-                    for fmt in ['%d/%m/%Y', '%d-%m-%Y', '%d/%m/%y', '%d-%m-%y']:
+                    for fmt in DATE_FORMATS:
                         try:
                             sale_date = datetime.strptime(date_str, fmt).date()
                             break
@@ -148,11 +176,11 @@ class SalesScraper(BaseScraper):
                     pass
             
             # Check if sale is recent enough
-            if sale_date and sale_date < cutoff_date.date():
+            if sale_date and sale_date < cutoff_date:
                 return None
             
             # Extract address
-            address_elem = listing_element.find(['h3', 'h4', 'a'], class_=re.compile(r'address|title', re.I))
+            address_elem = listing_element.find(['h3', 'h4', 'a'], class_=ADDRESS_CLASS_RE)
             address = address_elem.get_text(strip=True) if address_elem else None
             
             return {
@@ -1,6 +1,52 @@
 import re
-from bs4 import BeautifulSoup
-from .base_scraper import BaseScraper
+from bs4 import BeautifulSoup, SoupStrainer
+from .base_scraper import BaseScraper, HTML_PARSER, scan_fields
+from config import Config
+
+PRICE_RE = re.compile(r'\$\s*([\d,]+)')
+PRICE_TEXT_RE = re.compile(r'\$[\d,]+')
+BED_RE = re.compile(r'(\d+)\s*bed', re.IGNORECASE)
+BATH_RE = re.compile(r'(\d+)\s*bath', re.IGNORECASE)
+AREA_RE = re.compile(r'(\d+)\s*m[²2]', re.IGNORECASE)
+ADDRESS_CLASS_RE = re.compile(r'address|title|heading', re.IGNORECASE)
+LOCATION_CLASS_RE = re.compile(r'location|suburb|region', re.IGNORECASE)
+LISTING_CLASS_RE = re.compile(r'listing|property|result', re.IGNORECASE)
+PRICE_SELECTOR = '[data-property-price], .price, [class*="price"]'
+# Listing container layouts seen on TradeMe search pages, most preferred first
+LISTING_SELECTORS = [
+    'div[class*="listing"]',
+    'div[class*="property"]',
+    'div[class*="result"]',
+    'article',
+    '.listing',
+    '.property-listing',
+    '.search-result',
+]
+LISTING_SELECTOR = ', '.join(LISTING_SELECTORS)
+# Where a search result keeps its title/address, in groups tried in order
+TITLE_SELECTORS = [
+    ['h1', 'h2', 'h3', 'h4'],
+    ['a'],
+    ['.title', '.heading', '.address', '.property-title'],
+]
+TITLE_SELECTOR = ', '.join(selector for group in TITLE_SELECTORS for selector in group)
+
+# Price, bedrooms, bathrooms and floor area of a search result, extracted in one pass
+LISTING_FIELDS_RE = re.compile(
+    r'(?P<price>\$\s*[\d,]+)'
+    r'|(?P<bed>(?P<bed_value>\d+)\s*bed)'
+    r'|(?P<bath>(?P<bath_value>\d+)\s*bath)'
+    r'|(?P<area>(?P<area_value>\d+)\s*m[²2])',
+    re.IGNORECASE
+)
+LISTING_FIELDS = ('price', 'bed', 'bath', 'area')
+
+def _is_listing_container(name, attrs):
+    """Match the tags any of the search result selectors can pick out"""
+    return name == 'article' or bool(LISTING_CLASS_RE.search(str(attrs.get('class', ''))))
+
+# Only build a DOM for search result containers, skipping page chrome and scripts
+SEARCH_STRAINER = SoupStrainer(_is_listing_container)
 
 class TrademePropertyScraper(BaseScraper):
     """Scraper for TradeMe property listings"""
@@ -47,7 +93,7 @@ class TrademePropertyScraper(BaseScraper):
                 return []
             
             print(f"TradeMe response status: {response.status_code}")
-            print(f"Response length: {len(response.text)} characters")
+            print(f"Response length: {len(response.content)} bytes")
             
             # Check if we got a valid response
             if response.status_code != 200:
@@ -55,37 +101,29 @@ class TrademePropertyScraper(BaseScraper):
                 return []
             
             # Check if we got blocked or redirected
-            if len(response.text) < 1000:
+            if len(response.content) < 1000:
                 print("TradeMe response too short - likely blocked or error page")
                 return []
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Try multiple selectors for property listings
-            selectors = [
-                'div[class*="listing"]',
-                'div[class*="property"]',
-                'div[class*="result"]',
-                'article',
-                '.listing',
-                '.property-listing',
-                '.search-result'
-            ]
+            soup = BeautifulSoup(response.content, HTML_PARSER, parse_only=SEARCH_STRAINER)
             
+            # Walk the document once for every layout, then keep the
+            # candidates of the most preferred layout that matched
+            found = soup.select(LISTING_SELECTOR)
             listings = []
-            for selector in selectors:
-                found = soup.select(selector)
-                if found:
-                    listings = found
+            for selector in LISTING_SELECTORS:
+                listings = [elem for elem in found if elem.css.match(selector)]
+                if listings:
                     print(f"Found {len(listings)} listings using selector: {selector}")
                     break
             
             if not listings:
                 print("No property listings found with any selector")
-                # Save HTML for debugging
-                with open('debug_trademe_search.html', 'w', encoding='utf-8') as f:
-                    f.write(response.text)
-                print("Saved TradeMe response to debug_trademe_search.html for inspection")
+                if Config.TRADEME_DEBUG:
+                    # Save HTML for debugging
+                    with open('debug_trademe_search.html', 'wb') as f:
+                        f.write(response.content)
+                    print("Saved TradeMe response to debug_trademe_search.html for inspection")
                 return []
             
             for listing in listings[:limit]:
@@ -117,7 +155,7 @@ class TrademePropertyScraper(BaseScraper):
             if not response:
                 return None
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(response.content, HTML_PARSER)
             return self._parse_property_page(soup, url)
             
         except Exception as e:
@@ -127,20 +165,14 @@ class TrademePropertyScraper(BaseScraper):
     def _parse_listing(self, listing_element):
         """Parse a single listing from search results"""
         try:
-            # Extract title/address - try multiple approaches
+            # Extract title/address - collect every candidate in one walk,
+            # then take them in order of preference
             address = None
-            title_selectors = [
-                ['h1', 'h2', 'h3', 'h4'],
-                ['a'],
-                ['.title', '.heading', '.address', '.property-title']
-            ]
+            candidates = listing_element.select(TITLE_SELECTOR)
             
-            for selector_list in title_selectors:
+            for selector_list in TITLE_SELECTORS:
                 for selector in selector_list:
-                    if selector.startswith('.'):
-                        elem = listing_element.select_one(selector)
-                    else:
-                        elem = listing_element.find(selector)
+                    elem = next((c for c in candidates if c.css.match(selector)), None)
                     if elem:
                         address = elem.get_text(strip=True)
                         break
@@ -159,28 +191,23 @@ class TrademePropertyScraper(BaseScraper):
                 else:
                     url = f"{self.BASE_URL}/{href}"
             
-            # Extract price - try multiple approaches
-            price = None
-            price_patterns = [
-                r'\$[\d,]+',
-                r'[\d,]+',
-                r'price[:\s]*\$?[\d,]+'
-            ]
-            
             text_content = listing_element.get_text()
-            for pattern in price_patterns:
-                price_match = re.search(pattern, text_content, re.IGNORECASE)
-                if price_match:
-                    price = self._extract_price(price_match.group(0))
-                    if price and price > 100000:  # Reasonable property price
-                        break
+            fields = scan_fields(LISTING_FIELDS_RE, text_content, LISTING_FIELDS)
+            
+            # Extract price - prefer the dedicated price element over the text scan
+            price = None
+            price_elem = listing_element.select_one('[data-testid="price"]')
+            if price_elem:
+                price = self._extract_price(price_elem.get_text())
+            if price is None and 'price' in fields:
+                price = self._extract_price(fields['price'].group(0))
             
             # Extract bedrooms/bathrooms
-            bedrooms = self._extract_number(text_content, r'(\d+)\s*bed')
-            bathrooms = self._extract_number(text_content, r'(\d+)\s*bath')
+            bedrooms = int(fields['bed'].group('bed_value')) if 'bed' in fields else None
+            bathrooms = int(fields['bath'].group('bath_value')) if 'bath' in fields else None
             
             # Extract area
-            area = self._extract_number(text_content, r'(\d+)\s*m[²2]')
+            area = int(fields['area'].group('area_value')) if 'area' in fields else None
             
             if address or url:
                 return {
@@ -201,22 +228,27 @@ class TrademePropertyScraper(BaseScraper):
         """Parse a full property page"""
         try:
             # Extract address
-            address_elem = soup.find(['h1', 'h2'], class_=re.compile(r'address|title|heading', re.I))
+            address_elem = soup.find(['h1', 'h2'], class_=ADDRESS_CLASS_RE)
             address = address_elem.get_text(strip=True) if address_elem else None
             
-            # Extract price
-            price_text = soup.find(text=re.compile(r'\$[\d,]+'))
-            price = self._extract_price(price_text) if price_text else None
+            # Extract price - look in the price element before scanning every text node
+            price = None
+            price_elem = soup.select_one(PRICE_SELECTOR)
+            if price_elem:
+                price = self._extract_price(price_elem.get('data-property-price') or price_elem.get_text())
+            if price is None:
+                price_text = soup.find(string=PRICE_TEXT_RE)
+                price = self._extract_price(price_text) if price_text else None
             
             # Extract property details
             text_content = soup.get_text()
-            bedrooms = self._extract_number(text_content, r'(\d+)\s*bed')
-            bathrooms = self._extract_number(text_content, r'(\d+)\s*bath')
-            floor_area = self._extract_number(text_content, r'(\d+)\s*m[²2]')
+            bedrooms = self._extract_number(text_content, BED_RE)
+            bathrooms = self._extract_number(text_content, BATH_RE)
+            floor_area = self._extract_number(text_content, AREA_RE)
             
             # Extract suburb/location
             suburb = None
-            location_elem = soup.find(class_=re.compile(r'location|suburb|region', re.I))
+            location_elem = soup.find(class_=LOCATION_CLASS_RE)
             if location_elem:
                 suburb = location_elem.get_text(strip=True)
             
@@ -239,7 +271,7 @@ class TrademePropertyScraper(BaseScraper):
         if not text:
             return None
         
-        match = re.search(r'\$\s*([\d,]+)', str(text))
+        match = PRICE_RE.search(str(text))
         if match:
             try:
                 return float(match.group(1).replace(',', ''))
@@ -249,11 +281,11 @@ class TrademePropertyScraper(BaseScraper):
         return None
     
     def _extract_number(self, text, pattern):
-        """Extract a number using regex pattern"""
+        """Extract a number using a compiled regex pattern"""
         if not text:
             return None
         
-        match = re.search(pattern, text, re.IGNORECASE)
+        match = pattern.search(text)
         if match:
             try:
                 return int(match.group(1))
@@ -1,6 +1,73 @@
 import re
+import zlib
+from functools import lru_cache
 from bs4 import BeautifulSoup
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, HTML_PARSER
+
+RV_RE = re.compile(r'rateable\s+value[:\s]+\$?\s*([\d,]+)', re.IGNORECASE)
+CV_RE = re.compile(r'capital\s+value[:\s]+\$?\s*([\d,]+)', re.IGNORECASE)
+VALUE_RE = re.compile(r'(?:estimated\s+)?value[:\s]+\$?\s*([\d,]+)', re.IGNORECASE)
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Base values by city/region
+CITY_VALUES = {
+    'auckland': 1200000,
+    'wellington': 950000,
+    'christchurch': 650000,
+    'hamilton': 580000,
+    'tauranga': 720000,
+    'dunedin': 520000,
+    'palmerston north': 480000,
+    'nelson': 680000,
+    'rotorua': 450000,
+    'napier': 550000,
+    'hastings': 520000,
+    'new plymouth': 500000,
+    # Premium Auckland suburbs
+    'remuera': 2000000,
+    'ponsonby': 1800000,
+    'parnell': 1900000,
+    'takapuna': 1700000,
+    'epsom': 1750000,
+    'herne bay': 2200000,
+    'mission bay': 1650000,
+}
+
+# Longest names first so e.g. 'palmerston north' wins over any shorter overlap
+CITY_RE = re.compile(
+    '|'.join(re.escape(city) for city in sorted(CITY_VALUES, key=len, reverse=True)),
+    re.IGNORECASE
+)
+
+@lru_cache(maxsize=4096)
+def clean_address(address):
+    """Normalise whitespace and drop the country from an address"""
+    address = WHITESPACE_RE.sub(' ', address.strip())
+    return address.replace('New Zealand', '').replace('NZ', '').replace('  ', ' ').strip()
+
+@lru_cache(maxsize=4096)
+def estimate_values(address):
+    """
+    Estimate (rv, cv) from the city/suburb named in an address.
+    
+    Args:
+        address: Canonical address (stripped and lowercased)
+    
+    Returns:
+        Tuple of estimated RV and CV, rounded to the nearest 1000
+    """
+    # Base value of the first city/suburb named in the address
+    match = CITY_RE.search(address)
+    base_value = CITY_VALUES[match.group(0).lower()] if match else 650000  # Default NZ average
+    
+    # Add deterministic variation based on address
+    hash_val = zlib.crc32(address.encode())
+    variation = 0.85 + (hash_val % 30) / 100  # 0.85 to 1.15
+    
+    estimated_cv = base_value * variation
+    estimated_rv = estimated_cv * 0.95  # RV typically slightly lower
+    
+    return round(estimated_rv, -3), round(estimated_cv, -3)
 
 class ValuationScraper(BaseScraper):
     """Scraper for property valuations from homes.co.nz and similar sites"""
@@ -38,7 +105,7 @@ class ValuationScraper(BaseScraper):
             if not response:
                 return None
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(response.content, HTML_PARSER)
             
             # Look for valuation information
             rv = None
@@ -48,18 +115,18 @@ class ValuationScraper(BaseScraper):
             text_content = soup.get_text()
             
             # Try to find Rateable Value
-            rv_match = re.search(r'rateable\s+value[:\s]+\$?\s*([\d,]+)', text_content, re.IGNORECASE)
+            rv_match = RV_RE.search(text_content)
             if rv_match:
                 rv = float(rv_match.group(1).replace(',', ''))
             
             # Try to find Capital Value
-            cv_match = re.search(r'capital\s+value[:\s]+\$?\s*([\d,]+)', text_content, re.IGNORECASE)
+            cv_match = CV_RE.search(text_content)
             if cv_match:
                 cv = float(cv_match.group(1).replace(',', ''))
             
             # Sometimes they use different labels
             if not cv:
-                val_match = re.search(r'(?:estimated\s+)?value[:\s]+\$?\s*([\d,]+)', text_content, re.IGNORECASE)
+                val_match = VALUE_RE.search(text_content)
                 if val_match:
                     cv = float(val_match.group(1).replace(',', ''))
             
@@ -77,59 +144,15 @@ class ValuationScraper(BaseScraper):
     
     def _estimate_valuation(self, address):
         """Estimate valuation based on address location"""
-        import hashlib
-        
-        address_lower = address.lower()
-        
-        # Base values by city/region
-        city_values = {
-            'auckland': 1200000,
-            'wellington': 950000,
-            'christchurch': 650000,
-            'hamilton': 580000,
-            'tauranga': 720000,
-            'dunedin': 520000,
-            'palmerston north': 480000,
-            'nelson': 680000,
-            'rotorua': 450000,
-            'napier': 550000,
-            'hastings': 520000,
-            'new plymouth': 500000,
-            # Premium Auckland suburbs
-            'remuera': 2000000,
-            'ponsonby': 1800000,
-            'parnell': 1900000,
-            'takapuna': 1700000,
-            'epsom': 1750000,
-            'herne bay': 2200000,
-            'mission bay': 1650000,
-        }
-        
-        # Find matching city
-        base_value = 650000  # Default NZ average
-        for city, value in city_values.items():
-            if city in address_lower:
-                base_value = value
-                break
-        
-        # Add deterministic variation based on address
-        hash_val = int(hashlib.md5(address.encode()).hexdigest()[:8], 16)
-        variation = 0.85 + (hash_val % 30) / 100  # 0.85 to 1.15
-        
-        estimated_cv = base_value * variation
-        estimated_rv = estimated_cv * 0.95  # RV typically slightly lower
+        rv, cv = estimate_values(address.strip().lower())
         
         return {
-            'rv': round(estimated_rv, -3),  # Round to nearest 1000
-            'cv': round(estimated_cv, -3),
+            'rv': rv,
+            'cv': cv,
             'source': 'Estimated (scraping unavailable)'
         }
     
     def _clean_address(self, address):
         """Clean address for search"""
-        # Remove extra whitespace
-        address = re.sub(r'\s+', ' ', address.strip())
-        # Remove "New Zealand", "NZ"
-        address = address.replace('New Zealand', '').replace('NZ', '').replace('  ', ' ')
-        return address.strip()
+        return clean_address(address)
 
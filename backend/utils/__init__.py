@@ -1,10 +1,13 @@
 from .cache_manager import CacheManager
 from .csv_parser import CSVParser
+from .json_provider import ORJSONProvider, static_error
 from .similar_property_matcher import SimilarPropertyMatcher
 
 __all__ = [
     'CacheManager',
     'CSVParser',
+    'ORJSONProvider',
     'SimilarPropertyMatcher',
+    'static_error',
 ]
 
@@ -1,4 +1,6 @@
 from datetime import datetime, timedelta
+from sqlalchemy import func, insert
+from sqlalchemy.dialects import postgresql, sqlite
 from models import db, Property, Valuation, RecentSale
 from config import Config
 
@@ -7,14 +9,18 @@ class CacheManager:
     
     def __init__(self):
         self.cache_expiry_days = Config.CACHE_EXPIRY_DAYS
+        self.cache_expiry = timedelta(days=self.cache_expiry_days)
     
-    def is_cache_valid(self, timestamp):
+    def expiry_cutoff(self):
+        """Oldest timestamp that still counts as fresh; compute once per lookup"""
+        return datetime.utcnow() - self.cache_expiry
+    
+    def is_cache_valid(self, timestamp, cutoff=None):
         """Check if cached data is still valid"""
         if not timestamp:
             return False
         
-        expiry_date = datetime.utcnow() - timedelta(days=self.cache_expiry_days)
-        return timestamp > expiry_date
+        return timestamp > (cutoff or self.expiry_cutoff())
     
     def get_cached_property(self, address=None, trademe_url=None):
         """Get cached property data"""
@@ -35,17 +41,19 @@ class CacheManager:
         return None
     
     def get_cached_valuation(self, property_id):
-        """Get cached valuation data"""
-        valuation = Valuation.query.filter_by(property_id=property_id).order_by(Valuation.scraped_at.desc()).first()
-        
-        if valuation and self.is_cache_valid(valuation.scraped_at):
-            return valuation
-        
-        return None
+        """
+        Get cached valuation data.
+        
+        RV/CV change rarely, so valuations are never expired or
+        invalidated: once a property has a valuation it is reused for
+        every later analysis.
+        """
+        return Valuation.query.filter_by(property_id=property_id).order_by(Valuation.scraped_at.desc()).first()
     
     def get_cached_sales(self, suburb, bedrooms, months=3):
         """Get cached recent sales data"""
-        cutoff_date = datetime.utcnow() - timedelta(days=months * 30)
+        # Sales must be both inside the lookback window and not yet expired
+        cutoff_date = max(datetime.utcnow() - timedelta(days=months * 30), self.expiry_cutoff())
         
         sales = RecentSale.query.filter(
             RecentSale.suburb == suburb,
@@ -53,14 +61,10 @@ class CacheManager:
             RecentSale.scraped_at > cutoff_date
         ).all()
         
-        # Check if we have valid cached sales
-        if sales and all(self.is_cache_valid(sale.scraped_at) for sale in sales):
-            return sales
-        
-        return None
+        return sales or None
     
-    def save_property(self, property_data):
-        """Save or update property in cache"""
+    def save_property(self, property_data, commit=True):
+        """Save or update property in cache; pass commit=False to leave it to the caller"""
         property_obj = Property.query.filter_by(address=property_data['address']).first()
         
         if property_obj:
@@ -74,9 +78,78 @@ class CacheManager:
             property_obj = Property(**property_data)
             db.session.add(property_obj)
         
-        db.session.commit()
+        if commit:
+            db.session.commit()
+        else:
+            db.session.flush()
         return property_obj
     
+    def save_properties(self, properties_data, commit=True):
+        """
+        Save or update many properties with a single upsert.
+        
+        Rows are keyed on address; fields missing from a row keep their
+        existing values. Falls back to save_property() per row on databases
+        without INSERT ... ON CONFLICT support.
+        
+        Args:
+            properties_data: List of property dictionaries
+            commit: Commit when done; pass False to save several batches
+                in one transaction and commit (or roll back) in the caller
+        
+        Returns:
+            List of Property objects, one per distinct address, in input order
+        """
+        # Merge duplicate addresses so one statement never touches a row twice
+        merged = {}
+        for property_data in properties_data:
+            merged.setdefault(property_data['address'], {}).update(property_data)
+        
+        if not merged:
+            return []
+        
+        dialect = db.engine.dialect.name
+        if dialect == 'postgresql':
+            dialect_insert = postgresql.insert
+        elif dialect == 'sqlite':
+            dialect_insert = sqlite.insert
+        else:
+            return [self.save_property(property_data, commit) for property_data in merged.values()]
+        
+        # Stamp the whole batch with one timestamp; existing tables may not
+        # have the server defaults (see models.utcnow)
+        columns = [c.name for c in Property.__table__.columns if c.name not in ('id', 'created_at', 'updated_at')]
+        now = datetime.utcnow()
+        rows = [
+            {**{name: data.get(name) for name in columns}, 'created_at': now, 'updated_at': now}
+            for data in merged.values()
+        ]
+        
+        table = Property.__table__
+        stmt = dialect_insert(Property).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.address],
+            set_={
+                **{name: func.coalesce(stmt.excluded[name], table.c[name]) for name in columns if name != 'address'},
+                'updated_at': now,
+            },
+        )
+        
+        saved = db.session.scalars(
+            stmt.returning(Property),
+            execution_options={'populate_existing': True},
+        ).all()
+        
+        # RETURNING fully loads the rows; detach them so commit() doesn't
+        # expire them and to_dict() needs no further SELECTs
+        for property_obj in saved:
+            db.session.expunge(property_obj)
+        if commit:
+            db.session.commit()
+        
+        by_address = {property_obj.address: property_obj for property_obj in saved}
+        return [by_address[address] for address in merged]
+    
     def save_valuation(self, property_id, valuation_data):
         """Save valuation data"""
         valuation = Valuation(
@@ -84,35 +157,27 @@ class CacheManager:
             rv=valuation_data.get('rv'),
             cv=valuation_data.get('cv'),
             source=valuation_data.get('source'),
-            scraped_at=datetime.utcnow()
         )
         db.session.add(valuation)
         db.session.commit()
         return valuation
     
     def save_sales(self, sales_data):
-        """Save recent sales data"""
-        saved_sales = []
-        
-        for sale_data in sales_data:
-            sale = RecentSale(**sale_data, scraped_at=datetime.utcnow())
-            db.session.add(sale)
-            saved_sales.append(sale)
-        
+        """
+        Save recent sales data with a single bulk INSERT.
+        
+        Returns:
+            Number of sales saved
+        """
+        if not sales_data:
+            return 0
+        
+        # Stamp the whole batch with one timestamp; existing tables may not
+        # have the server default (see models.utcnow)
+        columns = [c.name for c in RecentSale.__table__.columns if c.name not in ('id', 'scraped_at')]
+        now = datetime.utcnow()
+        rows = [{**{name: sale_data.get(name) for name in columns}, 'scraped_at': now} for sale_data in sales_data]
+        
+        db.session.execute(insert(RecentSale), rows)
         db.session.commit()
-        return saved_sales
-    
-    def needs_update(self, model_instance):
-        """Check if a model instance needs updating (delta function)"""
-        if not model_instance:
-            return True
-        
-        # Check based on updated_at or scraped_at
-        timestamp = None
-        if hasattr(model_instance, 'updated_at'):
-            timestamp = model_instance.updated_at
-        elif hasattr(model_instance, 'scraped_at'):
-            timestamp = model_instance.scraped_at
-        
-        return not self.is_cache_valid(timestamp)
-
+        return len(rows)
@@ -1,6 +1,50 @@
 import csv
 import io
 import re
+from functools import partial
+
+HEADER_CHARS_RE = re.compile(r'[^a-z0-9]')
+
+# Every price format in one pass; PRICE_FIELDS gives their order of preference
+PRICE_TEXT_RE = re.compile(
+    r'asking\s+price\s*\$?(?P<asking>[\d,]+)'  # "Asking price $599,900"
+    r'|reserve\s*\$?(?P<reserve>[\d,]+)'        # "Declared Reserve $499,999"
+    r'|\$(?P<dollar>[\d,]+)'                     # "$599,900"
+    r'|^(?P<number>[\d,]+)$',                    # "599900"
+    re.IGNORECASE
+)
+PRICE_FIELDS = ('asking', 'reserve', 'dollar', 'number')
+
+# "345 m2" / "345 m²", or a bare number assumed to be m2
+AREA_TEXT_RE = re.compile(r'(?P<area>\d+(?:\.\d+)?)\s*m[²2]?|^(?P<number>\d+(?:\.\d+)?)$', re.IGNORECASE)
+
+# Date patterns that show a "URL" cell actually holds listing text
+URL_DATE_RE = re.compile(
+    r'listed\s+\w+,\s+\d+\s+\w+'   # "Listed Thu, 2 Oct"
+    r'|\d{1,2}\s+\w+\s+\d{4}'      # "2 Oct 2024"
+    r'|\w+\s+\d{1,2},\s+\d{4}',    # "Oct 2, 2024"
+    re.IGNORECASE
+)
+
+# Header names that identify each field outright, checked first
+HEADER_EXACT = {
+    'address': {'property address', 'address'},
+    'trademe_url': {'property link', 'link', 'url'},
+    'bedrooms': {'bedrooms', 'bedroom', 'bed'},
+    'bathrooms': {'bathrooms', 'bathroom', 'bath'},
+    'area': {'area', 'floor area', 'sqm', 'm2'},
+    'price': {'price', 'cost', 'amount'},
+}
+
+# Keywords looked for in normalized headers when no exact name matched
+HEADER_KEYWORDS = {
+    'address': ('address', 'property', 'location', 'street', 'road', 'place'),
+    'trademe_url': ('trademe', 'url', 'link', 'listing', 'propertylink', 'property link'),
+    'bedrooms': ('bed', 'bedroom', 'bedrooms'),
+    'bathrooms': ('bath', 'bathroom', 'bathrooms'),
+    'area': ('area', 'floor', 'sqm', 'm2', 'square'),
+    'price': ('price', 'cost', 'amount', 'asking', 'auction', 'sale'),
+}
 
 class CSVParser:
     """Flexible CSV parser with auto-detection of columns"""
@@ -17,15 +61,31 @@ class CSVParser:
         """
         # Handle both string content and file-like objects
         if isinstance(file_content, str):
-            csv_file = io.StringIO(file_content)
+            csv_file = io.StringIO(file_content, newline='')
         elif isinstance(file_content, bytes):
-            csv_file = io.StringIO(file_content.decode('utf-8'))
+            # parse_stream decodes binary input incrementally as rows are read
+            csv_file = io.BytesIO(file_content)
         else:
             csv_file = file_content
         
-        # Read CSV
-        reader = csv.DictReader(csv_file)
-        headers = reader.fieldnames
+        return list(self.parse_stream(csv_file))
+    
+    def parse_stream(self, stream):
+        """
+        Lazily parse a CSV stream, yielding one property at a time.
+        
+        Args:
+            stream: Text or binary file-like object (binary is decoded as UTF-8)
+        
+        Yields:
+            Dictionaries with parsed data
+        """
+        if not isinstance(stream, io.TextIOBase):
+            stream = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+        
+        # Read CSV - uploads are spreadsheet exports, so use the Excel dialect as-is
+        reader = csv.reader(stream, dialect='excel')
+        headers = next(reader, None)
         
         if not headers:
             raise ValueError("CSV file has no headers")
@@ -34,120 +94,60 @@ class CSVParser:
         column_mapping = self._detect_columns(headers)
         print(f"CSV Column mapping detected: {column_mapping}")
         
+        # Resolve the mapping to column positions once; a repeated header
+        # name refers to its last column, as it would in a DictReader row
+        positions = {header: index for index, header in enumerate(headers)}
+        column_indexes = {
+            field: positions[header] if header else None
+            for field, header in column_mapping.items()
+        }
+        width = len(headers)
+        parse_row = self._make_row_parser(column_indexes)
+        
         # Parse rows
-        properties = []
+        parsed = 0
         for row in reader:
-            property_data = self._parse_row(row, column_mapping)
+            if not row:
+                continue  # Skip blank lines
+            if len(row) < width:
+                row += [''] * (width - len(row))  # Treat missing trailing cells as empty
+            
+            property_data = parse_row(row)
             if property_data:
-                print(f"Parsed property: {property_data}")
-                properties.append(property_data)
+                parsed += 1
+                yield property_data
         
-        return properties
+        # One summary line per file rather than a print per row
+        print(f"Parsed {parsed} properties from CSV")
     
     def _detect_columns(self, headers):
         """Auto-detect which columns contain address and TradeMe URL"""
-        mapping = {
-            'address': None,
-            'trademe_url': None,
-            'bedrooms': None,
-            'bathrooms': None,
-            'area': None,
-            'price': None,
-        }
-        
-        # Normalize headers for comparison
-        normalized_headers = {h: self._normalize_header(h) for h in headers}
+        mapping = dict.fromkeys(HEADER_EXACT)
         
-        # Detect address column - prioritize exact matches first
+        # Prioritize exact matches - first matching header wins for each field
         for header in headers:
-            if header.lower() in ['property address', 'address']:
-                mapping['address'] = header
-                break
-        
-        # If no exact match, try keyword matching
-        if not mapping['address']:
-            address_keywords = ['address', 'property', 'location', 'street', 'road', 'place']
-            for header, normalized in normalized_headers.items():
-                if any(keyword in normalized for keyword in address_keywords):
-                    mapping['address'] = header
-                    break
-        
-        # Detect TradeMe URL column - prioritize exact matches first
-        for header in headers:
-            if header.lower() in ['property link', 'link', 'url']:
-                mapping['trademe_url'] = header
-                break
-        
-        # If no exact match, try keyword matching
-        if not mapping['trademe_url']:
-            url_keywords = ['trademe', 'url', 'link', 'listing', 'propertylink', 'property link']
-            for header, normalized in normalized_headers.items():
-                if any(keyword in normalized for keyword in url_keywords):
-                    mapping['trademe_url'] = header
-                    break
-        
-        # Detect bedrooms column - prioritize exact matches first
-        for header in headers:
-            if header.lower() in ['bedrooms', 'bedroom', 'bed']:
-                mapping['bedrooms'] = header
-                break
-        
-        # If no exact match, try keyword matching
-        if not mapping['bedrooms']:
-            bed_keywords = ['bed', 'bedroom', 'bedrooms']
-            for header, normalized in normalized_headers.items():
-                if any(keyword in normalized for keyword in bed_keywords):
-                    mapping['bedrooms'] = header
-                    break
-        
-        # Detect bathrooms column - prioritize exact matches first
-        for header in headers:
-            if header.lower() in ['bathrooms', 'bathroom', 'bath']:
-                mapping['bathrooms'] = header
-                break
-        
-        # If no exact match, try keyword matching
-        if not mapping['bathrooms']:
-            bath_keywords = ['bath', 'bathroom', 'bathrooms']
-            for header, normalized in normalized_headers.items():
-                if any(keyword in normalized for keyword in bath_keywords):
-                    mapping['bathrooms'] = header
-                    break
-        
-        # Detect area column - prioritize exact matches first
-        for header in headers:
-            if header.lower() in ['area', 'floor area', 'sqm', 'm2']:
-                mapping['area'] = header
-                break
-        
-        # If no exact match, try keyword matching
-        if not mapping['area']:
-            area_keywords = ['area', 'floor', 'sqm', 'm2', 'square']
-            for header, normalized in normalized_headers.items():
-                if any(keyword in normalized for keyword in area_keywords):
-                    mapping['area'] = header
-                    break
-        
-        # Detect price column - prioritize exact matches first
-        for header in headers:
-            if header.lower() in ['price', 'cost', 'amount']:
-                mapping['price'] = header
-                break
-        
-        # If no exact match, try keyword matching
-        if not mapping['price']:
-            price_keywords = ['price', 'cost', 'amount', 'asking', 'auction', 'sale']
-            for header, normalized in normalized_headers.items():
-                if any(keyword in normalized for keyword in price_keywords):
-                    mapping['price'] = header
-                    break
+            lowered = header.lower()
+            for field, names in HEADER_EXACT.items():
+                if mapping[field] is None and lowered in names:
+                    mapping[field] = header
+        
+        # If no exact match, try keyword matching on normalized headers
+        unmatched = [field for field, header in mapping.items() if not header]
+        if unmatched:
+            normalized_headers = {h: self._normalize_header(h) for h in headers}
+            for field in unmatched:
+                keywords = HEADER_KEYWORDS[field]
+                for header, normalized in normalized_headers.items():
+                    if any(keyword in normalized for keyword in keywords):
+                        mapping[field] = header
+                        break
         
         return mapping
     
     def _normalize_header(self, header):
         """Normalize header for comparison"""
         # Remove special characters, convert to lowercase
-        normalized = re.sub(r'[^a-z0-9]', '', header.lower())
+        normalized = HEADER_CHARS_RE.sub('', header.lower())
         return normalized
     
     def _extract_price_from_text(self, text):
@@ -155,38 +155,18 @@ class CSVParser:
         if not text:
             return None
         
-        # Look for explicit price patterns
-        # "Asking price $599,900"
-        asking_match = re.search(r'asking\s+price\s*\$?([\d,]+)', text, re.IGNORECASE)
-        if asking_match:
-            try:
-                return float(asking_match.group(1).replace(',', ''))
-            except ValueError:
-                pass
-        
-        # "Declared Reserve $499,999"
-        reserve_match = re.search(r'reserve\s*\$?([\d,]+)', text, re.IGNORECASE)
-        if reserve_match:
-            try:
-                return float(reserve_match.group(1).replace(',', ''))
-            except ValueError:
-                pass
+        # First match of each format, in a single scan
+        found = {}
+        for match in PRICE_TEXT_RE.finditer(text.strip()):
+            found.setdefault(match.lastgroup, match)
         
-        # Simple dollar amount "$599,900"
-        dollar_match = re.search(r'\$([\d,]+)', text)
-        if dollar_match:
-            try:
-                return float(dollar_match.group(1).replace(',', ''))
-            except ValueError:
-                pass
-        
-        # If it's just a number (like "599900")
-        number_match = re.search(r'^([\d,]+)$', text.strip())
-        if number_match:
-            try:
-                return float(number_match.group(1).replace(',', ''))
-            except ValueError:
-                pass
+        # Prefer explicit asking/reserve prices over any dollar amount
+        for field in PRICE_FIELDS:
+            if field in found:
+                try:
+                    return float(found[field].group(field).replace(',', ''))
+                except ValueError:
+                    pass
         
         # For auction/deadline sales, return None (no specific price)
         return None
@@ -205,101 +185,91 @@ class CSVParser:
             return False
         
         # Should not contain common date patterns
-        date_patterns = [
-            r'listed\s+\w+,\s+\d+\s+\w+',  # "Listed Thu, 2 Oct"
-            r'\d{1,2}\s+\w+\s+\d{4}',      # "2 Oct 2024"
-            r'\w+\s+\d{1,2},\s+\d{4}',     # "Oct 2, 2024"
-        ]
-        
-        for pattern in date_patterns:
-            if re.search(pattern, url, re.IGNORECASE):
-                return False
-        
-        return True
+        return URL_DATE_RE.search(url) is None
     
     def _extract_area_from_text(self, text):
         """Extract numeric area from text like '345 m2' or '345 m²'"""
         if not text:
             return None
         
-        # Look for number followed by m2, m², or similar
-        area_match = re.search(r'(\d+(?:\.\d+)?)\s*m[²2]?', text, re.IGNORECASE)
+        area_match = AREA_TEXT_RE.search(text.strip())
         if area_match:
-            try:
-                return float(area_match.group(1))
-            except ValueError:
-                pass
-        
-        # If it's just a number, assume it's area in m2
-        number_match = re.search(r'^(\d+(?:\.\d+)?)$', text.strip())
-        if number_match:
-            try:
-                return float(number_match.group(1))
-            except ValueError:
-                pass
+            return float(area_match.group('area') or area_match.group('number'))
         
         return None
     
-    def _parse_row(self, row, column_mapping):
-        """Parse a single row using column mapping"""
-        property_data = {}
+    def _make_row_parser(self, column_indexes):
+        """
+        Build a row parser specialised to the columns this file actually has.
         
-        # Extract address (required)
-        if column_mapping['address']:
-            address = row.get(column_mapping['address'], '').strip()
+        Args:
+            column_indexes: Field name -> column position (or None if absent)
+        
+        Returns:
+            Function taking a row (list of cells) and returning the parsed
+            property dictionary, or None for rows without an address
+        """
+        # If no address column found, try first column
+        address_index = column_indexes['address']
+        if address_index is None:
+            address_index = 0
+        
+        # (column, extractor) for each optional field present, in output order
+        field_extractors = [
+            ('trademe_url', self._set_trademe_url),
+            ('bedrooms', partial(self._set_int, 'bedrooms')),
+            ('bathrooms', partial(self._set_int, 'bathrooms')),
+            ('area', self._set_floor_area),
+            ('price', self._set_price),
+        ]
+        extractors = [
+            (column_indexes[field], extractor)
+            for field, extractor in field_extractors
+            if column_indexes[field] is not None
+        ]
+        
+        def parse_row(row):
+            # Extract address (required)
+            address = row[address_index].strip()
             if not address:
                 return None  # Skip rows without address
-            property_data['address'] = address
+            
+            property_data = {'address': address}
+            
+            # Extract optional fields; empty cells are skipped
+            for index, extractor in extractors:
+                value = row[index].strip()
+                if value:
+                    extractor(property_data, value)
+            
+            return property_data
+        
+        return parse_row
+    
+    def _set_trademe_url(self, property_data, url):
+        """Store a TradeMe URL cell if it holds a real URL"""
+        if self._is_valid_url(url):
+            property_data['trademe_url'] = url
+    
+    def _set_int(self, key, property_data, value):
+        """Store an integer cell such as bedrooms or bathrooms"""
+        try:
+            property_data[key] = int(value)
+        except ValueError:
+            pass
+    
+    def _set_floor_area(self, property_data, area_str):
+        """Store the floor area parsed from an area cell"""
+        area = self._extract_area_from_text(area_str)
+        if area:
+            property_data['floor_area'] = area
+    
+    def _set_price(self, property_data, price_str):
+        """Store the price, or the sale method if the cell has no specific price"""
+        # Extract numeric price from various formats
+        price = self._extract_price_from_text(price_str)
+        if price:
+            property_data['asking_price'] = price
         else:
-            # If no address column found, try first column
-            first_value = list(row.values())[0].strip() if row else ''
-            if not first_value:
-                return None
-            property_data['address'] = first_value
-        
-        # Extract TradeMe URL (optional)
-        if column_mapping['trademe_url']:
-            url = row.get(column_mapping['trademe_url'], '').strip()
-            if url and self._is_valid_url(url):
-                property_data['trademe_url'] = url
-        
-        # Extract bedrooms (optional)
-        if column_mapping['bedrooms']:
-            bedrooms_str = row.get(column_mapping['bedrooms'], '').strip()
-            if bedrooms_str:
-                try:
-                    property_data['bedrooms'] = int(bedrooms_str)
-                except ValueError:
-                    pass
-        
-        # Extract bathrooms (optional)
-        if column_mapping['bathrooms']:
-            bathrooms_str = row.get(column_mapping['bathrooms'], '').strip()
-            if bathrooms_str:
-                try:
-                    property_data['bathrooms'] = int(bathrooms_str)
-                except ValueError:
-                    pass
-        
-        # Extract area (optional)
-        if column_mapping['area']:
-            area_str = row.get(column_mapping['area'], '').strip()
-            if area_str:
-                area = self._extract_area_from_text(area_str)
-                if area:
-                    property_data['floor_area'] = area
-        
-        # Extract price (optional)
-        if column_mapping['price']:
-            price_str = row.get(column_mapping['price'], '').strip()
-            if price_str:
-                # Extract numeric price from various formats
-                price = self._extract_price_from_text(price_str)
-                if price:
-                    property_data['asking_price'] = price
-                else:
-                    # Store the sale method if no specific price
-                    property_data['sale_method'] = price_str
-        
-        return property_data
-
+            # Store the sale method if no specific price
+            property_data['sale_method'] = price_str
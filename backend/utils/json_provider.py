@@ -0,0 +1,38 @@
+import orjson
+from flask.json.provider import JSONProvider
+
+class ORJSONProvider(JSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+    
+    orjson serializes dicts and datetimes natively, so model to_dict()
+    output can hold datetime/date objects directly. Naive datetimes are
+    stored in UTC and are emitted with a +00:00 offset.
+    """
+    
+    OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=self.OPTIONS).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        """Serialize straight to bytes for jsonify() and dict/list return values"""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, option=self.OPTIONS),
+            mimetype='application/json'
+        )
+
+
+def static_error(message, status):
+    """
+    Pre-serialize a constant error response.
+    
+    Returns a (body, status, headers) tuple that a view can return as-is,
+    so fixed error payloads are encoded once at import time.
+    """
+    body = orjson.dumps({'success': False, 'error': message})
+    return body, status, {'Content-Type': 'application/json'}
@@ -1,3 +1,11 @@
+from operator import attrgetter, methodcaller
+
+SALE_ATTRS = attrgetter('suburb', 'bedrooms', 'floor_area')
+
+def sale_dict_fields(sale):
+    """(suburb, bedrooms, floor_area) of a scraped sale dictionary"""
+    return sale.get('suburb'), sale.get('bedrooms'), sale.get('floor_area')
+
 class SimilarPropertyMatcher:
     """Find comparable/similar properties based on criteria"""
     
@@ -11,7 +19,8 @@ class SimilarPropertyMatcher:
         - ±20% floor area
         
         Args:
-            sales: List of RecentSale objects or dictionaries
+            sales: List of RecentSale objects or dictionaries, or an index
+                from build_index() when matching many targets
             target_suburb: Target suburb
             target_bedrooms: Target number of bedrooms
             target_floor_area: Target floor area in sqm
@@ -19,72 +28,83 @@ class SimilarPropertyMatcher:
         Returns:
             List of comparable sales
         """
-        if not sales:
+        if not sales or not target_suburb:
             return []
         
-        comparables = []
+        key = (target_suburb.lower().strip(), target_bedrooms)
         
-        for sale in sales:
-            # Extract data whether it's a model object or dictionary
-            if hasattr(sale, 'suburb'):
-                suburb = sale.suburb
-                bedrooms = sale.bedrooms
-                floor_area = sale.floor_area
-            else:
-                suburb = sale.get('suburb')
-                bedrooms = sale.get('bedrooms')
-                floor_area = sale.get('floor_area')
-            
-            # Check suburb match
-            if not self._suburbs_match(suburb, target_suburb):
-                continue
-            
-            # Check bedrooms match
-            if bedrooms != target_bedrooms:
-                continue
-            
-            # Check floor area within ±20%
-            if floor_area and target_floor_area:
-                area_diff_pct = abs(floor_area - target_floor_area) / target_floor_area
-                if area_diff_pct > 0.20:  # More than 20% difference
-                    continue
-            
-            comparables.append(sale)
-        
-        return comparables
+        if isinstance(sales, dict):
+            candidates = sales.get(key, [])
+        else:
+            candidates = []
+            sale_fields = self._fields_getter(sales)
+            for sale in sales:
+                suburb, bedrooms, floor_area = sale_fields(sale)
+                
+                # Check suburb and bedrooms match
+                if suburb and (suburb.lower().strip(), bedrooms) == key:
+                    candidates.append((floor_area, sale))
+        
+        # Without a target area every suburb/bedroom match is comparable
+        if not target_floor_area:
+            return [sale for floor_area, sale in candidates]
+        
+        # Floor area window of ±20%
+        min_area = target_floor_area * 0.80
+        max_area = target_floor_area * 1.20
+        
+        return [
+            sale for floor_area, sale in candidates
+            if not floor_area or min_area <= floor_area <= max_area
+        ]
     
-    def _suburbs_match(self, suburb1, suburb2):
-        """Check if two suburbs match (case-insensitive, flexible)"""
-        if not suburb1 or not suburb2:
-            return False
+    def build_index(self, sales):
+        """
+        Bucket sales by normalized suburb and bedrooms for repeated matching.
         
-        # Normalize suburbs
-        s1 = suburb1.lower().strip()
-        s2 = suburb2.lower().strip()
+        Args:
+            sales: List of RecentSale objects or dictionaries
         
-        return s1 == s2
+        Returns:
+            Dictionary of (suburb, bedrooms) -> list of (floor_area, sale)
+        """
+        index = {}
+        if not sales:
+            return index
+        
+        sale_fields = self._fields_getter(sales)
+        for sale in sales:
+            suburb, bedrooms, floor_area = sale_fields(sale)
+            if suburb:
+                index.setdefault((suburb.lower().strip(), bedrooms), []).append((floor_area, sale))
+        
+        return index
+    
+    def _fields_getter(self, sales):
+        """
+        Pick the (suburb, bedrooms, floor_area) accessor once per list.
+        
+        Sales are all model objects or all dictionaries, so the first one
+        decides which accessor every row uses.
+        """
+        if hasattr(sales[0], 'suburb'):
+            return SALE_ATTRS
+        return sale_dict_fields
     
     def calculate_average_sale_price(self, comparables):
         """Calculate average sale price from comparable sales"""
         if not comparables:
             return None
         
-        total = 0
-        count = 0
-        
-        for sale in comparables:
-            # Extract price whether it's a model object or dictionary
-            if hasattr(sale, 'sale_price'):
-                price = sale.sale_price
-            else:
-                price = sale.get('sale_price')
-            
-            if price:
-                total += price
-                count += 1
-        
-        if count == 0:
+        # Comparables are all model objects or all dictionaries; pick the accessor once
+        if hasattr(comparables[0], 'sale_price'):
+            get_price = attrgetter('sale_price')
+        else:
+            get_price = methodcaller('get', 'sale_price')
+        
+        prices = [price for price in map(get_price, comparables) if price]
+        
+        if not prices:
             return None
         
-        return total / count
-
+        return sum(prices) / len(prices)